@@ -21,6 +21,9 @@ setup(
         "pyscf>=2.0.0",
         "matplotlib>=3.0.0",
     ],
+    extras_require={
+        "fast": ["numba", "joblib", "orjson"],
+    },
     entry_points={
         "console_scripts": [
             "scf-lite=scf_lite.cli:main",
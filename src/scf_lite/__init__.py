@@ -4,17 +4,36 @@ SCF Lite - Sistema minimalista para cálculos SCF usando PySCF
 
 __version__ = "0.1.0"
 
-from .calculator import calculate_scf
-from .input_validator import validate_input, load_input_file
-from .output_formatter import format_results
+from importlib import import_module
+
+# Submódulo que define cada nombre público; se importa al primer acceso
+# (PEP 562) para que `import scf_lite` o `scf-lite --help` no carguen PySCF
+_LAZY = {
+    "calculate_scf": ".calculator",
+    "calculate_scf_scan": ".calculator",
+    "iter_scf_scan": ".calculator",
+    "validate_input": ".input_validator",
+    "load_input_file": ".input_validator",
+    "format_results": ".output_formatter",
+}
 
 __all__ = [
     "calculate_scf",
+    "calculate_scf_scan",
+    "iter_scf_scan",
     "validate_input",
     "load_input_file",
     "format_results",
 ]
 
 
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
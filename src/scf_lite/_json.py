@@ -0,0 +1,65 @@
+"""
+Serialización JSON: orjson si está disponible, json de la biblioteca estándar si no
+"""
+
+import json
+import math
+
+import numpy as np
+
+try:
+    import orjson  # type: ignore[import]
+except ImportError:  # orjson es opcional: mismo resultado con json
+    orjson = None
+
+# orjson.JSONDecodeError hereda de json.JSONDecodeError: basta capturar esta
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data):
+    """
+    Decodifica JSON desde str o bytes (UTF-8).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _no_finito(obj) -> bool:
+    """
+    True si obj contiene algún float NaN/±Inf (orjson los escribiría como null).
+    """
+    if isinstance(obj, (float, np.floating)):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_no_finito(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_no_finito(v) for v in obj)
+    return False
+
+
+def _default(obj):
+    """
+    Escalares de NumPy (np.int64, np.bool_, ...) para json; el resto falla igual.
+    """
+    item = getattr(obj, "item", None)
+    if item is not None and getattr(obj, "shape", None) == ():
+        return item()
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    """
+    Codifica obj como JSON UTF-8 indentado a 2 espacios (sin escapar no-ASCII).
+
+    Los escalares de NumPy se aceptan con ambos backends. Los valores NaN/Inf
+    y cualquier tipo que orjson rechace pasan por json, que escribe
+    NaN/Infinity igual que sin orjson.
+    """
+    if orjson is not None and not _no_finito(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            # orjson.JSONEncodeError hereda de TypeError
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=_default).encode("utf-8")
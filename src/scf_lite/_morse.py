@@ -0,0 +1,150 @@
+"""
+Potencial tipo Morse y su Jacobiano analítico para los ajustes de escaneo
+"""
+
+import math
+import os
+from functools import lru_cache
+
+import numpy as np
+
+# A partir de este número de puntos compensa importar numba y compilar los
+# núcleos (~0.5 s); para un escaneo típico (~30 puntos) NumPy es igual de
+# rápido. SCF_LITE_NUMBA=1 fuerza el JIT siempre y SCF_LITE_NUMBA=0 lo desactiva.
+NUMBA_MIN_POINTS = 2000
+
+
+# Núcleos que escriben en un búfer `out` ya reservado: ufuncs de NumPy in situ
+def _morse_numpy(R, De, a, Re, E0, out):
+    t = -np.expm1(-a * (R - Re))
+    np.multiply(t, t, out=out)
+    out *= De
+    out += E0
+
+
+def _morse_jac_numpy(R, De, a, Re, E0, out):
+    d = R - Re
+    u = np.exp(-a * d)
+    t = -np.expm1(-a * d)
+    np.multiply(t, t, out=out[:, 0])
+    np.multiply(2.0 * De * t * u, d, out=out[:, 1])
+    np.multiply(-2.0 * De * a * t, u, out=out[:, 2])
+    out[:, 3] = 1.0
+
+
+# Versiones en bucle explícito, pensadas para compilarse con numba (sin temporales)
+def _morse_loop(R, De, a, Re, E0, out):
+    for i in range(R.shape[0]):
+        # -expm1(x) = 1 - exp(x) sin cancelación cerca de Re
+        t = -math.expm1(-a * (R[i] - Re))
+        out[i] = E0 + De * t * t
+
+
+def _morse_jac_loop(R, De, a, Re, E0, out):
+    for i in range(R.shape[0]):
+        d = R[i] - Re
+        u = math.exp(-a * d)
+        t = -math.expm1(-a * d)
+        out[i, 0] = t * t
+        out[i, 1] = 2.0 * De * t * u * d
+        out[i, 2] = -2.0 * De * t * u * a
+        out[i, 3] = 1.0
+
+
+@lru_cache(maxsize=None)
+def _jit_kernels():
+    """
+    Compila los núcleos en bucle con numba la primera vez que se piden.
+
+    Devuelve (morse, jacobiano) compilados, o None si numba no está instalado.
+    """
+    try:
+        from numba import njit  # type: ignore[import]
+    except ImportError:  # numba es opcional: sin él se usan las versiones NumPy
+        return None
+
+    jit = njit(cache=True, fastmath=True)
+    return jit(_morse_loop), jit(_morse_jac_loop)
+
+
+def _kernels(n):
+    """
+    Elige los núcleos (morse, jacobiano) para n puntos: NumPy por defecto,
+    numba si está pedido por SCF_LITE_NUMBA o si n >= NUMBA_MIN_POINTS.
+    """
+    modo = os.environ.get("SCF_LITE_NUMBA", "")
+    if modo == "0" or (modo != "1" and n < NUMBA_MIN_POINTS):
+        return _morse_numpy, _morse_jac_numpy
+    return _jit_kernels() or (_morse_numpy, _morse_jac_numpy)
+
+
+def morse(R, De, a, Re, E0):
+    """
+    E(R) = E0 + De (1 - exp(-a (R-Re)))^2
+    """
+    R = np.ascontiguousarray(R, dtype=np.float64)
+    out = np.empty_like(R)
+    _kernels(R.shape[0])[0](R, De, a, Re, E0, out)
+    return out
+
+
+def morse_jac(R, De, a, Re, E0):
+    """
+    Jacobiano de `morse` respecto a (De, a, Re, E0), forma (len(R), 4).
+    """
+    R = np.ascontiguousarray(R, dtype=np.float64)
+    # Búfer nuevo en cada llamada: least_squares conserva el Jacobiano devuelto
+    out = np.empty((R.shape[0], 4))
+    _kernels(R.shape[0])[1](R, De, a, Re, E0, out)
+    return out
+
+
+def morse_residual(p, R, E):
+    """
+    Residuo del ajuste para scipy.optimize.least_squares; p = (De, a, Re, E0).
+    """
+    out = morse(R, p[0], p[1], p[2], p[3])
+    out -= E
+    return out
+
+
+def morse_residual_jac(p, R, E):
+    """
+    Jacobiano de `morse_residual` respecto a p.
+    """
+    return morse_jac(R, p[0], p[1], p[2], p[3])
+
+
+# Límites físicos de (De, a, Re, E0) para el ajuste
+MORSE_BOUNDS = ([0.0, 0.1, 0.0, -np.inf], [np.inf, np.inf, np.inf, np.inf])
+
+
+def morse_initial_guess(R, E, a_fallback=1.5):
+    """
+    Estimación inicial (De, a, Re, E0) para el ajuste de Morse.
+
+    Con Re fijo en el mínimo de la malla, el modelo es lineal en (De, E0)
+    para cada valor de a: se resuelve esa regresión lineal sobre una rejilla
+    logarítmica de a y se toma la de menor residuo. Si ninguna da De > 0 se
+    usa a_fallback, con De y E0 tomados del mínimo y del último punto.
+    """
+    k = int(np.argmin(E))
+    Re0 = float(R[k])
+
+    a_grid = np.geomspace(0.1, 10.0, 64)
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        t2 = np.square(np.expm1(-np.outer(a_grid, R - Re0)))
+
+        # Regresión lineal E ≈ E0 + De t2 para cada a (una fila por valor de a)
+        dt = t2 - t2.mean(axis=1, keepdims=True)
+        De = dt @ (E - E.mean()) / np.einsum("ij,ij->i", dt, dt)
+        E0 = E.mean() - De * t2.mean(axis=1)
+        sse = ((E0[:, None] + De[:, None] * t2 - E) ** 2).sum(axis=1)
+
+    sse[~(De > 0.0) | ~np.isfinite(sse)] = np.inf
+    if np.isfinite(sse).any():
+        b = int(np.argmin(sse))
+        return [float(De[b]), float(a_grid[b]), Re0, float(E0[b])]
+
+    E00 = float(E[-1])
+    return [max(E00 - float(E[k]), 0.0), a_fallback, Re0, E00]
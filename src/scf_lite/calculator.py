@@ -3,17 +3,96 @@ Módulo principal para ejecutar cálculos SCF usando PySCF
 """
 
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple, Union
 
+import numpy as np
 from pyscf import gto, scf
 
 
+def _make_mf(
+    mol: gto.Mole,
+    spin: int,
+    density_fit: bool = False,
+    auxbasis: str = "weigend",
+    level_shift: float = 0.0,
+    damp: float = 0.0,
+    soscf: bool = False,
+):
+    """
+    Crea el objeto SCF (RHF o UHF según el spin) con las opciones pedidas.
+    """
+    if spin == 0:
+        mf = scf.RHF(mol)
+    else:
+        mf = scf.UHF(mol)
+
+    # Density fitting: integrales de 3 índices en vez de las ERI completas
+    if density_fit:
+        mf = mf.density_fit(auxbasis=auxbasis)
+
+    # Estabilizadores para geometrías difíciles (enlaces muy estirados)
+    mf.level_shift = level_shift
+    mf.damp = damp
+    if soscf:
+        mf = mf.newton()
+
+    return mf
+
+
+def _build_mol(
+    symbols: List[str],
+    coordinates: Sequence[Sequence[float]],
+    charge: int,
+    spin: int,
+    basis: str,
+    verbose: int,
+) -> gto.Mole:
+    """
+    Construye el objeto molecular de PySCF a partir de símbolos y coordenadas (Å).
+    """
+    # Lista de átomos en formato nativo de PySCF: [(símbolo, (x, y, z)), ...]
+    atom_list = [
+        (symbol, (float(coord[0]), float(coord[1]), float(coord[2])))
+        for symbol, coord in zip(symbols, coordinates)
+    ]
+    return gto.M(
+        atom=atom_list,
+        basis=basis,
+        charge=charge,
+        spin=spin,
+        # El objeto SCF hereda este nivel de log; 0 evita el volcado por punto
+        verbose=verbose,
+    )
+
+
+def _count_iterations(mf) -> List[int]:
+    """
+    Instala en mf un callback que cuenta los ciclos SCF.
+
+    Devuelve el contador (lista de un elemento), que mf.kernel() va
+    incrementando una vez por ciclo.
+    """
+    contador = [0]
+
+    def _callback(envs):
+        contador[0] += 1
+
+    mf.callback = _callback
+    return contador
+
+
 def calculate_scf(
     symbols: List[str],
     coordinates: List[List[float]],
     charge: int = 0,
     spin: int = 0,
-    basis: str = "sto-3g"
+    basis: str = "sto-3g",
+    density_fit: bool = False,
+    auxbasis: str = "weigend",
+    level_shift: float = 0.0,
+    damp: float = 0.0,
+    soscf: bool = False,
+    verbose: int = 0,
 ) -> Dict[str, Any]:
     """
     Ejecuta un cálculo SCF (RHF o UHF según corresponda).
@@ -24,38 +103,32 @@ def calculate_scf(
         charge: Carga total
         spin: Spin total (0 = singlete/RHF, != 0 = UHF)
         basis: Base a usar
+        density_fit: Usar density fitting (RI) para las integrales de dos electrones
+        auxbasis: Base auxiliar para density fitting
+        level_shift: Desplazamiento de niveles (Hartree) aplicado a los virtuales
+        damp: Factor de amortiguamiento de la densidad entre iteraciones
+        soscf: Usar SCF de segundo orden (mf.newton())
+        verbose: Nivel de log de PySCF (0 = silencioso)
 
     Returns:
         Dict con los resultados del cálculo
     """
-    # Construir la cadena de átomos para PySCF
-    atom_string = []
-    for symbol, coord in zip(symbols, coordinates):
-        atom_string.append(f"{symbol} {coord[0]} {coord[1]} {coord[2]}")
-
     # Crear objeto molecular
-    mol = gto.M(
-        atom=atom_string,
-        basis=basis,
-        charge=charge,
-        spin=spin,
-    )
+    mol = _build_mol(symbols, coordinates, charge, spin, basis, verbose)
 
     # Elegir método SCF según el spin
-    if spin == 0:
-        mf = scf.RHF(mol)
-    else:
-        mf = scf.UHF(mol)
+    mf = _make_mf(
+        mol,
+        spin,
+        density_fit=density_fit,
+        auxbasis=auxbasis,
+        level_shift=level_shift,
+        damp=damp,
+        soscf=soscf,
+    )
 
     # Contador de iteraciones usando callback
-    iter_count = 0
-
-    def _count_iterations(envs):
-        nonlocal iter_count
-        # Se llama una vez por ciclo SCF
-        iter_count += 1
-
-    mf.callback = _count_iterations
+    iter_count = _count_iterations(mf)
 
     # Ejecutar cálculo con medición de tiempo
     t0 = time.perf_counter()
@@ -63,7 +136,7 @@ def calculate_scf(
     t1 = time.perf_counter()
 
     # Recuperar número de iteraciones
-    n_iter = iter_count or mf.scf_summary.get("niter", 0)
+    n_iter = iter_count[0] or mf.scf_summary.get("niter", 0)
 
     # Recopilar resultados
     resultados: Dict[str, Any] = {
@@ -82,5 +155,167 @@ def calculate_scf(
     return resultados
 
 
+# Objetos moleculares de escaneo ya construidos en este proceso
+_MOL_CACHE: Dict[Tuple, gto.Mole] = {}
+_MOL_CACHE_SIZE = 8
 
 
+def _scan_mol(
+    symbols: List[str],
+    coords: Sequence[Sequence[float]],
+    charge: int,
+    spin: int,
+    basis: str,
+    verbose: int,
+) -> gto.Mole:
+    """
+    Devuelve el objeto molecular para un escaneo, construyéndolo solo la
+    primera vez por (símbolos, carga, spin, base, verbose) en cada proceso.
+
+    Las rondas sucesivas de un escaneo adaptativo (y cada proceso del pool)
+    reutilizan así la base ya procesada; quien lo usa fija siempre la
+    geometría con set_geom_ antes de cada SCF.
+    """
+    clave = (tuple(symbols), charge, spin, basis, verbose)
+    mol = _MOL_CACHE.get(clave)
+    if mol is None:
+        mol = _build_mol(symbols, coords, charge, spin, basis, verbose)
+        if len(_MOL_CACHE) >= _MOL_CACHE_SIZE:
+            _MOL_CACHE.pop(next(iter(_MOL_CACHE)))
+        _MOL_CACHE[clave] = mol
+    return mol
+
+
+def iter_scf_scan(
+    symbols: List[str],
+    coords_list: List[List[List[float]]],
+    charge: int = 0,
+    spin: int = 0,
+    basis: str = "sto-3g",
+    tighten: Optional[float] = None,
+    density_fit: bool = False,
+    auxbasis: str = "weigend",
+    level_shift: Union[float, Sequence[float]] = 0.0,
+    damp: Union[float, Sequence[float]] = 0.0,
+    soscf: bool = False,
+    verbose: int = 0,
+    dm0: Optional[Sequence[Optional[np.ndarray]]] = None,
+    return_dm: bool = False,
+) -> Iterator[Tuple[float, int]]:
+    """
+    Ejecuta cálculos SCF para varias geometrías de la misma molécula,
+    entregando cada resultado en cuanto converge (generador).
+
+    El objeto molecular se construye una sola vez; entre puntos solo se
+    actualizan las coordenadas con `set_geom_`, evitando volver a procesar
+    la base en cada geometría. Cada SCF arranca desde la matriz densidad
+    convergida del punto anterior, que para geometrías vecinas es una
+    conjetura inicial mucho mejor que la de PySCF por defecto. El objeto
+    molecular se conserva entre llamadas del mismo proceso (ver _scan_mol).
+
+    Args:
+        symbols: Lista de símbolos químicos (igual para todas las geometrías)
+        coords_list: Lista de geometrías (o ndarray de forma (n, natom, 3)),
+            cada una con coordenadas 3D en Angstrom
+        charge: Carga total
+        spin: Spin total (0 = singlete/RHF, != 0 = UHF)
+        basis: Base a usar
+        tighten: Si se indica, conv_tol usado solo en el último punto
+        density_fit: Usar density fitting (RI) para las integrales de dos electrones
+        auxbasis: Base auxiliar para density fitting
+        level_shift: Desplazamiento de niveles (Hartree), único o uno por geometría
+        damp: Factor de amortiguamiento, único o uno por geometría
+        soscf: Usar SCF de segundo orden (mf.newton())
+        verbose: Nivel de log de PySCF (0 = silencioso)
+        dm0: Densidad inicial por geometría (p. ej. la de un punto vecino ya
+            convergido); donde falte (None) se usa la del punto anterior
+        return_dm: Entregar también la matriz densidad convergida
+
+    Yields:
+        Tuplas (energía, iteraciones), o (energía, iteraciones, densidad) con
+        return_dm, en el mismo orden que coords_list
+    """
+    if len(coords_list) == 0:
+        return
+
+    mol = _scan_mol(symbols, coords_list[0], charge, spin, basis, verbose)
+
+    # Misma molécula y mismas capas: la densidad previa es reutilizable tal cual
+    dm_prev = None
+    last = len(coords_list) - 1
+
+    level_shifts = np.broadcast_to(np.asarray(level_shift, dtype=float), (last + 1,))
+    damps = np.broadcast_to(np.asarray(damp, dtype=float), (last + 1,))
+
+    for k, coords in enumerate(coords_list):
+        # Con un ndarray PySCF solo reescribe las coordenadas en mol._env
+        # (con listas volvería a ejecutar mol.build())
+        mol.set_geom_(np.asarray(coords, dtype=float), unit="Angstrom")
+
+        mf = _make_mf(
+            mol,
+            spin,
+            density_fit=density_fit,
+            auxbasis=auxbasis,
+            level_shift=float(level_shifts[k]),
+            damp=float(damps[k]),
+            soscf=soscf,
+        )
+
+        if tighten is not None and k == last:
+            mf.conv_tol = tighten
+
+        iter_count = _count_iterations(mf)
+
+        dm_init = dm_prev
+        if dm0 is not None and dm0[k] is not None:
+            dm_init = dm0[k]
+
+        energia = mf.kernel(dm0=dm_init)
+        dm_prev = mf.make_rdm1()
+
+        if return_dm:
+            yield float(energia), int(iter_count[0]), dm_prev
+        else:
+            yield float(energia), int(iter_count[0])
+
+
+def calculate_scf_scan(
+    symbols: List[str],
+    coords_list: List[List[List[float]]],
+    charge: int = 0,
+    spin: int = 0,
+    basis: str = "sto-3g",
+    tighten: Optional[float] = None,
+    density_fit: bool = False,
+    auxbasis: str = "weigend",
+    level_shift: Union[float, Sequence[float]] = 0.0,
+    damp: Union[float, Sequence[float]] = 0.0,
+    soscf: bool = False,
+    verbose: int = 0,
+    dm0: Optional[Sequence[Optional[np.ndarray]]] = None,
+) -> List[Tuple[float, int]]:
+    """
+    Como iter_scf_scan, pero devuelve todos los resultados de una vez
+    (mismos argumentos, sin return_dm).
+
+    Returns:
+        Lista de tuplas (energía, iteraciones) en el mismo orden que coords_list
+    """
+    return list(
+        iter_scf_scan(
+            symbols,
+            coords_list,
+            charge=charge,
+            spin=spin,
+            basis=basis,
+            tighten=tighten,
+            density_fit=density_fit,
+            auxbasis=auxbasis,
+            level_shift=level_shift,
+            damp=damp,
+            soscf=soscf,
+            verbose=verbose,
+            dm0=dm0,
+        )
+    )
@@ -3,128 +3,597 @@ Interfaz de línea de comandos para SCF Lite
 """
 
 import argparse
-import json
+import os
 import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, Iterator
 
+# Moléculas pequeñas (hasta Ca, bases modestas): el reparto de hilos de
+# BLAS/OpenMP cuesta más que las GEMM que acelera; los escaneos ya se
+# paralelizan por procesos. Debe fijarse antes de importar NumPy/PySCF;
+# setdefault respeta un valor exportado por el usuario.
+for _var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+import numpy as np
+
+from ._json import JSONDecodeError, dumps
 from .input_validator import validate_input, load_input_file
-from .calculator import calculate_scf
-from .output_formatter import format_results
 
+# calculator (PySCF) y output_formatter se importan donde se usan: --help y
+# los errores de argumentos/validación no deben pagar la importación de PySCF
+
+# Conversión Hartree -> kcal/mol (para referencia)
+HARTREE_TO_KCAL = 627.509
+
+# A partir de este múltiplo de la distancia de referencia se estabiliza el SCF
+STRETCH_FACTOR = 1.5
+
+# Memo LRU en proceso de puntos de escaneo:
+# clave -> (energía, iteraciones, densidad convergida o None)
+_SCF_CACHE: "OrderedDict[tuple, tuple[float, int, np.ndarray | None]]" = OrderedDict()
+_SCF_CACHE_SIZE = 256
+
+# Memo LRU de ajustes de Morse: (R.tobytes(), E.tobytes()) -> (De, a, Re, E0)
+_MORSE_CACHE: "OrderedDict[tuple[bytes, bytes], np.ndarray]" = OrderedDict()
+_MORSE_CACHE_SIZE = 32
+
+# Intervalos bisecados por ronda del muestreo adaptativo. Fijo (no
+# os.cpu_count()) para que las distancias y el ajuste no dependan de la
+# máquina; el pool solo reparte los puntos de cada ronda
+_ADAPTIVE_BATCH = 4
+
+# Figura de escaneo y sus artistas, reutilizados entre escaneos (ver _scan_axes)
+_FIG = None
+_AX = None
+_LINE_PTS = None
+_PT_MIN = None
+_VLINE_MIN = None
+_LINE_FIT = None
+_EQ_TEXT = None
 
-def run_h2_scan() -> None:
+
+def _headless() -> bool:
     """
-    Escaneo rápido de la molécula H2 (energía vs distancia)
-    y gráfico interactivo usando matplotlib.
+    True en Linux sin servidor gráfico (CI, nodos de cálculo, SSH sin -X).
+    """
+    return sys.platform.startswith("linux") and not (
+        os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")
+    )
+
+
+def _select_backend(save_path: str | None) -> None:
+    """
+    Elige Agg si no hay pantalla o si el gráfico solo se va a guardar.
+
+    Debe llamarse antes de la primera importación de pyplot: Agg evita
+    cargar Qt/Tk. Se respeta MPLBACKEND (p. ej. el backend inline de
+    Jupyter) y un pyplot que el usuario ya haya importado.
+    """
+    if "MPLBACKEND" in os.environ or "matplotlib.pyplot" in sys.modules:
+        return
+    if save_path or _headless():
+        import matplotlib
+
+        matplotlib.use("Agg")
+
+
+@lru_cache(maxsize=None)
+def _pyplot():
+    """
+    Importa matplotlib.pyplot una sola vez por proceso.
+
+    Se difiere hasta el primer gráfico: ni el cálculo simple ni los
+    procesos del pool de escaneo pagan su importación.
     """
-    import numpy as np
     import matplotlib.pyplot as plt
 
-    # Rango de distancias H-H en Angstrom
-    distances = np.linspace(0.4, 2.5, 30)
-    energies = []
+    return plt
 
-    symbols = ["H", "H"]
 
-    for r in distances:
-        coordinates = [[0.0, 0.0, 0.0], [float(r), 0.0, 0.0]]
-        resultados = calculate_scf(
+def _init_worker() -> None:
+    """
+    Inicializa un proceso del pool de escaneo.
+
+    Cada proceso ya ejecuta un SCF completo; limitamos el OpenMP interno
+    de PySCF a un hilo para no sobre-suscribir los núcleos (solo en el
+    entorno del proceso hijo, nunca en el del padre). Es una función
+    de módulo (no una lambda) para que el ejecutor pueda serializarla.
+    """
+    os.environ["OMP_NUM_THREADS"] = "1"
+
+    from pyscf import lib
+
+    lib.num_threads(1)
+
+
+def _scf_chunk(args: tuple) -> list[tuple[float, int, np.ndarray | None]]:
+    """
+    Calcula las energías SCF de un bloque contiguo de puntos del escaneo.
+
+    Recibe una tupla (symbols, coords_list, charge, spin, basis, opciones,
+    cache_dir, semillas) para poder despacharse desde ProcessPoolExecutor
+    (debe ser picklable); `opciones` se pasa tal cual a iter_scf_scan y
+    `semillas` son las densidades iniciales por punto (o None). Dentro del
+    bloque se reutiliza el mismo objeto molecular y cada punto sin semilla
+    parte de la densidad del anterior. Devuelve tuplas (energía,
+    iteraciones, densidad convergida).
+
+    Con cache_dir (y joblib instalado) el resultado del bloque se persiste
+    en disco y se reutiliza entre ejecuciones; esa caché guarda solo
+    energía e iteraciones, así que la densidad se devuelve como None.
+    """
+    from .calculator import calculate_scf_scan, iter_scf_scan
+
+    symbols, coords_list, charge, spin, basis, opciones, cache_dir, semillas = args
+
+    if cache_dir:
+        try:
+            from joblib import Memory  # type: ignore[import]
+        except ImportError:
+            pass
+        else:
+            # La semilla no cambia el resultado convergido: fuera de la clave
+            calcular = Memory(cache_dir, verbose=0).cache(
+                calculate_scf_scan, ignore=["verbose", "dm0"]
+            )
+            return [
+                (energia, n_iter, None)
+                for energia, n_iter in calcular(
+                    symbols,
+                    coords_list,
+                    charge=charge,
+                    spin=spin,
+                    basis=basis,
+                    dm0=semillas,
+                    **opciones,
+                )
+            ]
+
+    return list(
+        iter_scf_scan(
             symbols,
-            coordinates,
-            charge=0,
-            spin=0,
-            basis="sto-3g",
+            coords_list,
+            charge=charge,
+            spin=spin,
+            basis=basis,
+            dm0=semillas,
+            return_dm=True,
+            **opciones,
         )
-        energies.append(resultados["energia"])
+    )
 
-    energies_arr = np.array(energies)
-    distances_arr = np.array(distances)
 
-    # Encontrar mínimo
-    idx_min = int(np.argmin(energies_arr))
-    r_min = float(distances_arr[idx_min])
-    e_min = float(energies_arr[idx_min])
+def _scan_executor(max_workers: int | None = None):
+    """
+    Crea el pool de procesos de los escaneos, o nullcontext() si solo hay
+    un núcleo. Se usa como gestor de contexto y puede durar todo un escaneo
+    (todas las rondas del muestreo adaptativo).
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers <= 1:
+        return nullcontext()
+
+    # Importar PySCF en el padre antes de crear el pool: los procesos
+    # creados con fork lo heredan ya cargado en vez de importarlo cada uno
+    from . import calculator  # noqa: F401
+
+    # El límite de hilos se fija solo dentro de cada proceso (_init_worker):
+    # el entorno del proceso padre no se toca
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+
+
+def _compute_energies(
+    symbols: list[str],
+    coords_arr: np.ndarray,
+    charge: int,
+    spin: int,
+    basis: str,
+    opciones: dict,
+    cache_dir: str | None,
+    semillas: list[np.ndarray | None] | None = None,
+    executor: ProcessPoolExecutor | None = None,
+) -> Iterator[tuple[float, int, np.ndarray | None]]:
+    """
+    Evalúa en paralelo la energía SCF de cada geometría de coords_arr.
+
+    Las geometrías se reparten en bloques contiguos, uno por proceso
+    (hasta os.cpu_count()); las opciones ndarray y las semillas se reparten
+    con ellas. Si se da `executor` se usa ese pool; si no, se crea uno solo
+    para esta llamada. Es un generador: entrega (energía, iteraciones,
+    densidad) en el orden de coords_arr a medida que termina cada punto
+    (en serie) o cada bloque (en paralelo).
+    """
+    processes = min(os.cpu_count() or 1, len(coords_arr))
+
+    if processes <= 1:
+        if cache_dir:
+            # La caché en disco trabaja por bloques completos
+            yield from _scf_chunk(
+                (symbols, coords_arr, charge, spin, basis, opciones, cache_dir, semillas)
+            )
+            return
+
+        from .calculator import iter_scf_scan
+
+        yield from iter_scf_scan(
+            symbols,
+            coords_arr,
+            charge=charge,
+            spin=spin,
+            basis=basis,
+            dm0=semillas,
+            return_dm=True,
+            **opciones,
+        )
+        return
+
+    chunk = -(-len(coords_arr) // processes)
+    tasks = [
+        (
+            symbols,
+            coords_arr[k : k + chunk],
+            charge,
+            spin,
+            basis,
+            {
+                clave: valor[k : k + chunk] if isinstance(valor, np.ndarray) else valor
+                for clave, valor in opciones.items()
+            },
+            cache_dir,
+            semillas[k : k + chunk] if semillas is not None else None,
+        )
+        for k in range(0, len(coords_arr), chunk)
+    ]
+
+    with nullcontext(executor) if executor is not None else _scan_executor(len(tasks)) as ex:
+        # map conserva el orden de las tareas: no hace falta reordenar por R
+        for bloque in ex.map(_scf_chunk, tasks):
+            yield from bloque
+
+
+def _cache_key(
+    symbols: list[str],
+    coords: np.ndarray,
+    charge: int,
+    spin: int,
+    basis: str,
+    opciones: dict,
+) -> tuple:
+    """
+    Clave de _SCF_CACHE para un punto: coordenadas redondeadas a 1e-8 Å y
+    opciones SCF que afectan al resultado (el nivel de log no cuenta).
+    """
+    return (
+        tuple(symbols),
+        np.round(coords, 8).tobytes(),
+        charge,
+        spin,
+        basis,
+        tuple(sorted((k, v) for k, v in opciones.items() if k != "verbose")),
+    )
+
+
+def _scan_energies(
+    symbols: list[str],
+    coords_list: list[list[list[float]]],
+    charge: int,
+    spin: int,
+    basis: str,
+    cache_dir: str | None = None,
+    progreso: Callable[[int, float, int], None] | None = None,
+    semillas: list[np.ndarray | None] | None = None,
+    executor: ProcessPoolExecutor | None = None,
+    **opciones,
+) -> tuple[np.ndarray, np.ndarray, list[np.ndarray | None]]:
+    """
+    Evalúa la energía SCF de cada geometría del escaneo.
+
+    Los puntos ya calculados en este proceso (misma geometría, molécula y
+    opciones) se toman de _SCF_CACHE; el resto se calcula en paralelo. Las
+    opciones extra (density_fit, auxbasis, ...) se reenvían a
+    calculate_scf_scan; las que son ndarray se interpretan como un valor por
+    punto. Si se da `progreso`, se llama como progreso(k, energía,
+    iteraciones) en cuanto se calcula cada punto k nuevo. `semillas` son
+    densidades iniciales por punto y `executor` un pool compartido (ver
+    _compute_energies). Devuelve (energías, iteraciones, densidades) en el
+    mismo orden que coords_list; las dos primeras como arrays.
+    """
+    coords_arr = np.asarray(coords_list, dtype=float)
+    n = len(coords_arr)
+
+    def _opciones_punto(k: int) -> dict:
+        return {
+            clave: float(valor[k]) if isinstance(valor, np.ndarray) else valor
+            for clave, valor in opciones.items()
+        }
+
+    claves = [
+        _cache_key(symbols, coords_arr[k], charge, spin, basis, _opciones_punto(k))
+        for k in range(n)
+    ]
+    pendientes = [k for k in range(n) if claves[k] not in _SCF_CACHE]
+
+    if pendientes:
+        idx = np.array(pendientes)
+        nuevos = _compute_energies(
+            symbols,
+            coords_arr[idx],
+            charge,
+            spin,
+            basis,
+            {
+                clave: valor[idx] if isinstance(valor, np.ndarray) else valor
+                for clave, valor in opciones.items()
+            },
+            cache_dir,
+            semillas=[semillas[k] for k in pendientes] if semillas is not None else None,
+            executor=executor,
+        )
+        for k, punto in zip(pendientes, nuevos):
+            _SCF_CACHE[claves[k]] = punto
+            if progreso is not None:
+                progreso(k, punto[0], punto[1])
+
+    # Arrays preasignados: rellenados por índice, sin listas intermedias
+    energias = np.empty(n)
+    iteraciones = np.empty(n, dtype=np.int64)
+    densidades: list[np.ndarray | None] = [None] * n
+    for k, clave in enumerate(claves):
+        _SCF_CACHE.move_to_end(clave)
+        energias[k], iteraciones[k], densidades[k] = _SCF_CACHE[clave]
+
+    while len(_SCF_CACHE) > _SCF_CACHE_SIZE:
+        _SCF_CACHE.popitem(last=False)
+
+    return energias, iteraciones, densidades
+
+
+def _stretched_options(
+    distances: np.ndarray,
+    r0: float,
+    level_shift: float,
+    damp: float,
+) -> dict:
+    """
+    Opciones SCF por punto del escaneo.
 
-    # Conversión Hartree -> kcal/mol (para referencia)
-    HARTREE_TO_KCAL = 627.509
+    En los puntos muy estirados (R > STRETCH_FACTOR * r0) RHF suele oscilar,
+    así que ahí se usa al menos level_shift=0.2 y damp=0.3.
+    """
+    estirado = distances > STRETCH_FACTOR * r0
+    return {
+        "level_shift": np.where(estirado, max(level_shift, 0.2), level_shift),
+        "damp": np.where(estirado, max(damp, 0.3), damp),
+    }
 
-    # Imprimir tabla en terminal
-    print("Escaneo H2 (RHF / STO-3G)")
-    print("R_HH (Å)   E (Hartree)     ΔE (kcal/mol)   nota")
-    for r, e in zip(distances_arr, energies_arr):
-        delta_e = (e - e_min) * HARTREE_TO_KCAL
-        mark = "<-- mínimo" if abs(r - r_min) < 1e-8 else ""
-        print(f"{r:7.3f}   {e: .8f}   {delta_e:10.3f}   {mark}")
 
-    # Intentar ajuste tipo Morse: E(R) = E0 + De (1 - exp(-a (R-Re)))^2
-    morse_params = None
+def _interval_errors(rs: np.ndarray, es: np.ndarray) -> np.ndarray:
+    """
+    Estimación del error de interpolación lineal en cada intervalo [r_i, r_i+1].
 
+    Para cada terna de puntos vecinos se mide cuánto se aparta el punto
+    central de la recta que une sus vecinos (una segunda diferencia válida
+    para mallas no uniformes); cada intervalo toma el máximo de sus ternas.
+    """
+    t = (rs[1:-1] - rs[:-2]) / (rs[2:] - rs[:-2])
+    desvio = np.abs(es[1:-1] - (es[:-2] + t * (es[2:] - es[:-2])))
+
+    errores = np.zeros(len(rs) - 1)
+    errores[:-1] = desvio
+    errores[1:] = np.maximum(errores[1:], desvio)
+    return errores
+
+
+def adaptive_scan(
+    eval_fn: Callable[[np.ndarray], tuple[np.ndarray, np.ndarray]],
+    r_lo: float,
+    r_hi: float,
+    rtol: float = 2e-3,
+    max_pts: int = 30,
+    n_init: int = 8,
+    batch: int = 1,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Muestreo adaptativo de distancias para un escaneo de energía.
+
+    Parte de n_init puntos equiespaciados en [r_lo, r_hi] y bisecciona los
+    intervalos donde la curva E(R) se aparta más de una recta (alrededor del
+    mínimo y en la pared repulsiva), hasta agotar max_pts o hasta que la
+    máxima segunda diferencia local quede por debajo de rtol. En la cola
+    plana de disociación se gastan pocos cálculos.
+
+    Args:
+        eval_fn: Recibe un array de distancias y devuelve dos arrays
+            (energías, iteraciones), en el mismo orden
+        r_lo: Distancia mínima (Å)
+        r_hi: Distancia máxima (Å)
+        rtol: Umbral (Hartree) de la segunda diferencia local para detenerse
+        max_pts: Número máximo de cálculos SCF
+        n_init: Puntos equiespaciados iniciales
+        batch: Intervalos bisecados por ronda (se evalúan en un solo lote)
+
+    Returns:
+        Tuple (distancias, energías, iteraciones), ordenadas por distancia
+    """
+    # Búferes de tamaño máximo; los m primeros puntos son los ya calculados
+    rs = np.empty(max_pts)
+    es = np.empty(max_pts)
+    its = np.empty(max_pts, dtype=np.int64)
+
+    m = min(n_init, max_pts)
+    rs[:m] = np.linspace(r_lo, r_hi, m)
+    es[:m], its[:m] = eval_fn(rs[:m])
+
+    while m < max_pts:
+        order = np.argsort(rs[:m])
+        rs[:m], es[:m], its[:m] = rs[order], es[order], its[order]
+
+        if m < 3:
+            break
+        # Un intervalo junto a una energía NaN no tiene error estimable: no se
+        # refina ni impide la parada
+        errores = np.nan_to_num(_interval_errors(rs[:m], es[:m]), nan=0.0, posinf=0.0)
+        if errores.max() < rtol:
+            break
+
+        n_new = min(batch, max_pts - m)
+        # Orden estable: ante empates gana siempre el intervalo de menor R
+        peores = np.argsort(-errores, kind="stable")[:n_new]
+        peores = peores[errores[peores] >= rtol]
+        nuevos = 0.5 * (rs[peores] + rs[peores + 1])
+
+        k = len(nuevos)
+        if k == 0:
+            break
+        rs[m : m + k] = nuevos
+        es[m : m + k], its[m : m + k] = eval_fn(nuevos)
+        m += k
+
+    order = np.argsort(rs[:m])
+    return rs[order], es[order], its[order]
+
+
+def _save_scan_csv(path: str, distances_arr: np.ndarray, energies_arr: np.ndarray) -> None:
+    """
+    Guarda los puntos del escaneo (R en Å, E en Hartree) en un archivo CSV.
+    """
+    np.savetxt(
+        path,
+        np.c_[distances_arr, energies_arr],
+        fmt="%.10f",
+        header="R,E",
+        delimiter=",",
+        comments="",
+    )
+
+
+def _fit_morse(R: np.ndarray, E: np.ndarray) -> np.ndarray | None:
+    """
+    Ajusta el potencial tipo Morse a los puntos (R, E).
+
+    Devuelve (De, a, Re, E0), o None si SciPy no está disponible o el
+    ajuste falla.
+    """
     try:
-        from scipy.optimize import curve_fit  # type: ignore[import]
-
-        def morse(R, De, a, Re, E0):
-            return E0 + De * (1.0 - np.exp(-a * (R - Re))) ** 2
-
-        # Estimaciones iniciales razonables
-        De0 = e_min - float(energies_arr[-1])
-        a0 = 1.5
-        Re0 = r_min
-        E00 = float(energies_arr[-1])
-
-        popt, _ = curve_fit(
-            morse,
-            distances_arr,
-            energies_arr,
-            p0=[De0, a0, Re0, E00],
-            maxfev=10000,
+        from scipy.optimize import least_squares  # type: ignore[import]
+
+        from ._morse import (
+            MORSE_BOUNDS,
+            morse_initial_guess,
+            morse_residual,
+            morse_residual_jac,
+        )
+
+        p0 = morse_initial_guess(R, E)
+
+        # Energías SCF con ~1e-8 Ha de precisión: 1e-6 relativo basta para la curva
+        res = least_squares(
+            morse_residual,
+            np.clip(p0, *MORSE_BOUNDS),
+            jac=morse_residual_jac,
+            bounds=MORSE_BOUNDS,
+            args=(R, E),
+            method="trf",
+            xtol=1e-6,
+            ftol=1e-6,
         )
-        morse_params = popt  # type: ignore[assignment]
+        return res.x
     except Exception:
-        morse_params = None
+        return None
 
-    # Gráfico
-    plt.figure()
-    plt.plot(distances_arr, energies_arr, marker="o", label="E(R) puntos SCF")
-    plt.scatter([r_min], [e_min], color="red", zorder=5, label="Mínimo")
-    plt.axvline(r_min, color="red", linestyle="--", alpha=0.5)
 
+def _scan_axes():
+    """
+    Devuelve la figura del escaneo y sus artistas, creándolos la primera vez.
+
+    La figura se reutiliza entre escaneos sucesivos (p. ej. un bucle sobre
+    bases en un notebook) actualizando los datos de cada artista; solo se
+    vuelve a crear si el usuario la cerró.
+    """
+    global _FIG, _AX, _LINE_PTS, _PT_MIN, _VLINE_MIN, _LINE_FIT, _EQ_TEXT
+
+    plt = _pyplot()
+    if _FIG is not None and plt.fignum_exists(_FIG.number):
+        return _FIG, _AX
+
+    _FIG, _AX = plt.subplots()
+    (_LINE_PTS,) = _AX.plot([], [], marker="o", label="E(R) puntos SCF")
+    (_PT_MIN,) = _AX.plot([], [], "o", color="red", zorder=5, label="Mínimo")
+    _VLINE_MIN = _AX.axvline(0.0, color="red", linestyle="--", alpha=0.5)
+    # Colección de segmentos: más ligera que un Line2D para una curva solo de referencia
+    from matplotlib.collections import LineCollection
+
+    _LINE_FIT = _AX.add_collection(
+        LineCollection([], colors="orange", label="Ajuste tipo Morse"), autolim=False
+    )
+    _EQ_TEXT = _AX.annotate(
+        "",
+        xy=(0.05, 0.95),
+        xycoords="axes fraction",
+        va="top",
+        fontsize=8,
+        bbox=dict(boxstyle="round", fc="white", alpha=0.85),
+    )
+    _AX.grid(True)
+    _AX.set_ylabel("Energía (Hartree)")
+    return _FIG, _AX
+
+
+def _draw_scan(
+    distances_arr: np.ndarray,
+    energies_arr: np.ndarray,
+    r_min: float,
+    e_min: float,
+    morse_params: np.ndarray | None,
+    xlabel: str,
+    title: str,
+):
+    """
+    Dibuja (o actualiza en la figura cacheada) la curva E(R) de un escaneo,
+    su mínimo y, si se pudo ajustar, la curva tipo Morse con su ecuación.
+    """
+    fig, ax = _scan_axes()
+
+    _LINE_PTS.set_data(distances_arr, energies_arr)
+    _PT_MIN.set_data([r_min], [e_min])
+    _VLINE_MIN.set_xdata([r_min, r_min])
+
+    handles = [_LINE_PTS, _PT_MIN]
     if morse_params is not None:
+        from ._morse import morse
+
         De_fit, a_fit, Re_fit, E0_fit = morse_params
 
-        R_fine = np.linspace(distances_arr.min(), distances_arr.max(), 400)
-        E_fine = E0_fit + De_fit * (1.0 - np.exp(-a_fit * (R_fine - Re_fit))) ** 2
-        plt.plot(R_fine, E_fine, color="orange", label="Ajuste tipo Morse")
+        # 200 puntos sobran para la resolución en píxeles
+        R_fine = np.linspace(distances_arr.min(), distances_arr.max(), 200)
+        E_fine = morse(R_fine, De_fit, a_fit, Re_fit, E0_fit)
+        _LINE_FIT.set_segments([np.column_stack((R_fine, E_fine))])
 
-        # Texto formateado con sintaxis tipo LaTeX para que se vea limpio
-        eq_text = (
+        _EQ_TEXT.set_text(
             r"$E(R) \approx E_0 + D_e \left(1 - e^{-a (R-R_e)}\right)^2$" "\n"
             rf"$D_e = {De_fit:.3f}\ \mathrm{{Ha}}$" "\n"
             rf"$R_e = {Re_fit:.3f}\ \mathrm{{\AA}},\ a = {a_fit:.3f}\ \mathrm{{\AA}}^{{-1}}$" "\n"
             rf"$E_0 = {E0_fit:.3f}\ \mathrm{{Ha}}$"
         )
-        plt.annotate(
-            eq_text,
-            xy=(0.05, 0.95),
-            xycoords="axes fraction",
-            va="top",
-            fontsize=8,
-            bbox=dict(boxstyle="round", fc="white", alpha=0.85),
-        )
+        handles.append(_LINE_FIT)
+    _LINE_FIT.set_visible(morse_params is not None)
+    _EQ_TEXT.set_visible(morse_params is not None)
 
-        print("\nAjuste tipo Morse (aprox.):")
-        print("E(R) = E0 + De (1 - exp(-a (R-Re)))^2")
-        print(f"De  = {De_fit:.6f} Ha")
-        print(f"Re  = {Re_fit:.6f} Å")
-        print(f"a   = {a_fit:.6f} Å^-1")
-        print(f"E0  = {E0_fit:.6f} Ha")
+    ax.set_xlabel(xlabel)
+    ax.set_title(title)
+    ax.legend(handles=handles)
+    ax.relim(visible_only=True)
+    ax.autoscale_view()
+    fig.tight_layout()
 
-    plt.xlabel("Distancia H-H (Å)")
-    plt.ylabel("Energía (Hartree)")
-    plt.title("Curva de energía para H₂ (RHF / STO-3G)")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    # Que plt.show()/savefig actúen sobre esta figura
+    _pyplot().figure(fig.number)
+    return fig
 
 
 def run_bond_scan(
@@ -135,14 +604,29 @@ def run_bond_scan(
     charge: int,
     spin: int,
     basis: str,
+    plot: bool = True,
+    csv_path: str | None = None,
+    density_fit: bool = False,
+    auxbasis: str = "weigend",
+    level_shift: float = 0.0,
+    damp: float = 0.0,
+    soscf: bool = False,
+    verbose: int = 0,
+    uniform: bool = False,
+    r_range: tuple[float, float] | None = None,
+    titulo: str | None = None,
+    cache_dir: str | None = None,
+    save_plot: str | None = None,
+    progreso: bool | None = None,
 ) -> None:
     """
     Escaneo genérico de un enlace entre los átomos i y j
     usando la geometría proporcionada por el usuario.
-    """
-    import numpy as np
-    import matplotlib.pyplot as plt
 
+    Fija el átomo i y mueve j sobre la dirección original del enlace entre
+    r_range (por defecto 0.7·R0 a 1.3·R0). Es la única implementación de
+    escaneo: run_h2_scan y run_oh_scan la llaman con geometrías fijas.
+    """
     natom = len(symbols)
     if not (0 <= i < natom and 0 <= j < natom):
         raise ValueError(f"Índices de enlace fuera de rango: i={i}, j={j}, natom={natom}")
@@ -159,231 +643,188 @@ def run_bond_scan(
 
     direction = r0_vec / r0
 
-    # Escanear de 70% a 130% de la distancia original
-    distances = np.linspace(0.7 * r0, 1.3 * r0, 30)
-    energies: list[float] = []
-
     sym_i = symbols[i]
     sym_j = symbols[j]
-
-    for r in distances:
-        coords_scan = coords.copy()
-        # Fijamos átomo i y movemos j a lo largo de la dirección original
-        coords_scan[j] = ri + direction * float(r)
-        resultados = calculate_scf(
+    enlace = f"{sym_i}{i+1}–{sym_j}{j+1}"
+    if titulo is None:
+        titulo = f"enlace {enlace}"
+    metodo = "RHF" if spin == 0 else "UHF"
+    if progreso is None:
+        # Filas de progreso solo en una terminal interactiva, no en logs/CI
+        progreso = sys.stderr.isatty()
+
+    # Escanear de 70% a 130% de la distancia original salvo que se indique otro rango
+    if r_range is None:
+        r_range = (0.7 * r0, 1.3 * r0)
+    r_lo, r_hi = r_range
+
+    # Distancias ya calculadas en este escaneo y su densidad convergida
+    r_hechas: list[float] = []
+    dm_hechas: list[np.ndarray | None] = []
+
+    def evaluar(rs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # Todas las geometrías en un único bloque (npuntos, natom, 3): fijamos
+        # el átomo i y movemos j a lo largo de la dirección original
+        coords_scan = np.repeat(coords[np.newaxis], len(rs), axis=0)
+        coords_scan[:, j] = ri + np.outer(rs, direction)
+
+        # Cada punto nuevo (p. ej. un punto medio del muestreo adaptativo)
+        # arranca desde la densidad del punto ya calculado más cercano
+        semillas = None
+        if r_hechas:
+            vecino = np.abs(rs[:, np.newaxis] - np.array(r_hechas)).argmin(axis=1)
+            semillas = [dm_hechas[v] for v in vecino]
+
+        def _fila_progreso(k: int, energia: float, n_iter: int) -> None:
+            # Cada punto en cuanto converge; la tabla final (con ΔE) va a stdout
+            sys.stderr.write(f"  R = {rs[k]:7.3f} Å   E = {energia: .8f}   iter {n_iter:4d}\n")
+
+        energias, iteraciones, densidades = _scan_energies(
             symbols,
-            coords_scan.tolist(),
-            charge=charge,
-            spin=spin,
-            basis=basis,
+            coords_scan,
+            charge,
+            spin,
+            basis,
+            density_fit=density_fit,
+            auxbasis=auxbasis,
+            soscf=soscf,
+            verbose=verbose,
+            cache_dir=cache_dir,
+            progreso=_fila_progreso if progreso else None,
+            semillas=semillas,
+            executor=executor,
+            **_stretched_options(rs, r0, level_shift, damp),
         )
-        energies.append(resultados["energia"])
-
-    energies_arr = np.array(energies)
-    distances_arr = np.array(distances)
+        r_hechas.extend(rs.tolist())
+        dm_hechas.extend(densidades)
+        return energias, iteraciones
+
+    # Un único pool para todo el escaneo (todas las rondas adaptativas)
+    with _scan_executor() as executor:
+        if uniform:
+            distances_arr = np.linspace(r_lo, r_hi, 30)
+            energies_arr, niters = evaluar(distances_arr)
+        else:
+            distances_arr, energies_arr, niters = adaptive_scan(
+                evaluar, r_lo, r_hi, batch=_ADAPTIVE_BATCH
+            )
 
     # Encontrar mínimo
     idx_min = int(np.argmin(energies_arr))
     r_min = float(distances_arr[idx_min])
     e_min = float(energies_arr[idx_min])
 
-    HARTREE_TO_KCAL = 627.509
+    delta_e_arr = (energies_arr - e_min) * HARTREE_TO_KCAL
+    marks = np.where(np.abs(distances_arr - r_min) < 1e-8, "<-- mínimo", "")
 
-    print(f"Escaneo enlace {sym_i}{i+1}–{sym_j}{j+1} (RHF/UHF, base {basis})")
-    print("R (Å)      E (Hartree)     ΔE (kcal/mol)   nota")
-    for r, e in zip(distances_arr, energies_arr):
-        delta_e = (e - e_min) * HARTREE_TO_KCAL
-        mark = "<-- mínimo" if abs(r - r_min) < 1e-8 else ""
-        print(f"{r:7.3f}   {e: .8f}   {delta_e:10.3f}   {mark}")
+    # Toda la tabla en una sola escritura (escaneos largos = cientos de filas)
+    filas = "\n".join(
+        f"{r:7.3f}   {e: .8f}   {de:10.3f}   {n:4d}   {mk}"
+        for r, e, de, n, mk in zip(distances_arr, energies_arr, delta_e_arr, niters, marks)
+    )
+    sys.stdout.write(
+        f"Escaneo {titulo} ({metodo} / {basis.upper()})\n"
+        "R (Å)      E (Hartree)     ΔE (kcal/mol)   iter   nota\n"
+        f"{filas}\n"
+        f"Iteraciones SCF totales: {int(niters.sum())}\n"
+    )
 
-    # Ajuste tipo Morse
-    morse_params = None
-    try:
-        from scipy.optimize import curve_fit  # type: ignore[import]
-
-        def morse(R, De, a, Re, E0):
-            return E0 + De * (1.0 - np.exp(-a * (R - Re))) ** 2
-
-        De0 = e_min - float(energies_arr[-1])
-        a0 = 1.5
-        Re0 = r_min
-        E00 = float(energies_arr[-1])
-
-        popt, _ = curve_fit(
-            morse,
-            distances_arr,
-            energies_arr,
-            p0=[De0, a0, Re0, E00],
-            maxfev=10000,
-        )
-        morse_params = popt  # type: ignore[assignment]
-    except Exception:
-        morse_params = None
+    if csv_path:
+        _save_scan_csv(csv_path, distances_arr, energies_arr)
+
+    # Sin gráfico tampoco hace falta el ajuste de Morse
+    if not plot:
+        return
 
-    plt.figure()
-    plt.plot(distances_arr, energies_arr, marker="o", label="E(R) puntos SCF")
-    plt.scatter([r_min], [e_min], color="red", zorder=5, label="Mínimo")
-    plt.axvline(r_min, color="red", linestyle="--", alpha=0.5)
+    # Ajuste tipo Morse
+    # iter_scf_scan entrega la última energía aunque el SCF no converja, así
+    # que esos puntos sí entran en la tabla y en el ajuste. Aquí solo se
+    # descartan las energías no finitas (un SCF divergido), porque
+    # least_squares no las filtra por sí mismo
+    finitos = np.isfinite(energies_arr)
+    R_fit = distances_arr[finitos]
+    E_fit = energies_arr[finitos]
+
+    # Mismos puntos (p. ej. escaneo repetido servido desde _SCF_CACHE): mismo ajuste
+    clave_morse = (R_fit.tobytes(), E_fit.tobytes())
+    morse_params = _MORSE_CACHE.get(clave_morse)
+    if morse_params is None:
+        morse_params = _fit_morse(R_fit, E_fit)
+        if morse_params is not None:
+            _MORSE_CACHE[clave_morse] = morse_params
+            while len(_MORSE_CACHE) > _MORSE_CACHE_SIZE:
+                _MORSE_CACHE.popitem(last=False)
+    else:
+        _MORSE_CACHE.move_to_end(clave_morse)
 
     if morse_params is not None:
         De_fit, a_fit, Re_fit, E0_fit = morse_params
-
-        R_fine = np.linspace(distances_arr.min(), distances_arr.max(), 400)
-        E_fine = E0_fit + De_fit * (1.0 - np.exp(-a_fit * (R_fine - Re_fit))) ** 2
-        plt.plot(R_fine, E_fine, color="orange", label="Ajuste tipo Morse")
-
-        eq_text = (
-            r"$E(R) \approx E_0 + D_e \left(1 - e^{-a (R-R_e)}\right)^2$" "\n"
-            rf"$D_e = {De_fit:.3f}\ \mathrm{{Ha}}$" "\n"
-            rf"$R_e = {Re_fit:.3f}\ \mathrm{{\AA}},\ a = {a_fit:.3f}\ \mathrm{{\AA}}^{{-1}}$" "\n"
-            rf"$E_0 = {E0_fit:.3f}\ \mathrm{{Ha}}$"
-        )
-        plt.annotate(
-            eq_text,
-            xy=(0.05, 0.95),
-            xycoords="axes fraction",
-            va="top",
-            fontsize=8,
-            bbox=dict(boxstyle="round", fc="white", alpha=0.85),
-        )
-
-        print("\nAjuste tipo Morse (enlace, aprox.):")
+        print("\nAjuste tipo Morse (aprox.):")
         print("E(R) = E0 + De (1 - exp(-a (R-Re)))^2")
         print(f"De  = {De_fit:.6f} Ha")
         print(f"Re  = {Re_fit:.6f} Å")
         print(f"a   = {a_fit:.6f} Å^-1")
         print(f"E0  = {E0_fit:.6f} Ha")
 
-    plt.xlabel(f"Distancia {sym_i}{i+1}–{sym_j}{j+1} (Å)")
-    plt.ylabel("Energía (Hartree)")
-    plt.title(f"Curva de energía para enlace {sym_i}{i+1}–{sym_j}{j+1}")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    _select_backend(save_plot)
+    fig = _draw_scan(
+        distances_arr,
+        energies_arr,
+        r_min,
+        e_min,
+        morse_params,
+        xlabel=f"Distancia {enlace} (Å)",
+        title=f"Curva de energía para {titulo} ({metodo} / {basis.upper()})",
+    )
+    if save_plot:
+        fig.savefig(save_plot, dpi=120)
+        print(f"\nGráfico guardado en {save_plot}")
+    elif _headless():
+        print("Aviso: no hay pantalla; usa --save-plot PATH para guardar el gráfico", file=sys.stderr)
+    else:
+        _pyplot().show()
 
 
-def run_oh_scan() -> None:
-    """
-    Escaneo del enlace O-H en la molécula de agua (H2O)
-    manteniendo fija la geometría del resto.
+def run_h2_scan(**opciones) -> None:
     """
-    import numpy as np
-    import matplotlib.pyplot as plt
-
-    # Geometría base de agua (la misma que en examples/water.json)
-    O = np.array([0.0, 0.0, 0.0])
-    H1 = np.array([0.0, -0.757, 0.587])
-    H2 = np.array([0.0, 0.757, 0.587])
-
-    r0 = np.linalg.norm(H1 - O)
-    direction = (H1 - O) / r0
-
-    # Escaneamos alrededor de la distancia de equilibrio
-    distances = np.linspace(0.7 * r0, 1.3 * r0, 30)
-    energies = []
-
-    symbols = ["O", "H", "H"]
-
-    for r in distances:
-        H1_new = O + direction * float(r)
-        coordinates = [
-            O.tolist(),
-            H1_new.tolist(),
-            H2.tolist(),
-        ]
-        resultados = calculate_scf(
-            symbols,
-            coordinates,
-            charge=0,
-            spin=0,
-            basis="sto-3g",
-        )
-        energies.append(resultados["energia"])
-
-    energies_arr = np.array(energies)
-    distances_arr = np.array(distances)
-
-    # Encontrar mínimo
-    idx_min = int(np.argmin(energies_arr))
-    r_min = float(distances_arr[idx_min])
-    e_min = float(energies_arr[idx_min])
-
-    HARTREE_TO_KCAL = 627.509
-
-    print("Escaneo O-H en H2O (RHF / STO-3G)")
-    print("R_OH (Å)   E (Hartree)     ΔE (kcal/mol)   nota")
-    for r, e in zip(distances_arr, energies_arr):
-        delta_e = (e - e_min) * HARTREE_TO_KCAL
-        mark = "<-- mínimo" if abs(r - r_min) < 1e-8 else ""
-        print(f"{r:7.3f}   {e: .8f}   {delta_e:10.3f}   {mark}")
-
-    # Ajuste tipo Morse para el enlace O-H
-    morse_params = None
-
-    try:
-        from scipy.optimize import curve_fit  # type: ignore[import]
-
-        def morse(R, De, a, Re, E0):
-            return E0 + De * (1.0 - np.exp(-a * (R - Re))) ** 2
-
-        De0 = e_min - float(energies_arr[-1])
-        a0 = 2.0
-        Re0 = r_min
-        E00 = float(energies_arr[-1])
-
-        popt, _ = curve_fit(
-            morse,
-            distances_arr,
-            energies_arr,
-            p0=[De0, a0, Re0, E00],
-            maxfev=10000,
-        )
-        morse_params = popt  # type: ignore[assignment]
-    except Exception:
-        morse_params = None
-
-    plt.figure()
-    plt.plot(distances_arr, energies_arr, marker="o", label="E(R) puntos SCF")
-    plt.scatter([r_min], [e_min], color="red", zorder=5, label="Mínimo")
-    plt.axvline(r_min, color="red", linestyle="--", alpha=0.5)
-
-    if morse_params is not None:
-        De_fit, a_fit, Re_fit, E0_fit = morse_params
+    Escaneo rápido de la molécula H2 (energía vs distancia)
+    y gráfico interactivo usando matplotlib.
 
-        R_fine = np.linspace(distances_arr.min(), distances_arr.max(), 400)
-        E_fine = E0_fit + De_fit * (1.0 - np.exp(-a_fit * (R_fine - Re_fit))) ** 2
-        plt.plot(R_fine, E_fine, color="orange", label="Ajuste tipo Morse")
+    Acepta las mismas opciones de palabra clave que run_bond_scan.
+    """
+    run_bond_scan(
+        ["H", "H"],
+        [[0.0, 0.0, 0.0], [0.74, 0.0, 0.0]],
+        0,
+        1,
+        charge=0,
+        spin=0,
+        basis="sto-3g",
+        r_range=(0.4, 2.5),
+        titulo="H₂",
+        **opciones,
+    )
 
-        eq_text = (
-            r"$E(R) \approx E_0 + D_e \left(1 - e^{-a (R-R_e)}\right)^2$" "\n"
-            rf"$D_e = {De_fit:.3f}\ \mathrm{{Ha}}$" "\n"
-            rf"$R_e = {Re_fit:.3f}\ \mathrm{{\AA}},\ a = {a_fit:.3f}\ \mathrm{{\AA}}^{{-1}}$" "\n"
-            rf"$E_0 = {E0_fit:.3f}\ \mathrm{{Ha}}$"
-        )
-        plt.annotate(
-            eq_text,
-            xy=(0.05, 0.95),
-            xycoords="axes fraction",
-            va="top",
-            fontsize=8,
-            bbox=dict(boxstyle="round", fc="white", alpha=0.85),
-        )
 
-        print("\nAjuste tipo Morse (O-H, aprox.):")
-        print("E(R) = E0 + De (1 - exp(-a (R-Re)))^2")
-        print(f"De  = {De_fit:.6f} Ha")
-        print(f"Re  = {Re_fit:.6f} Å")
-        print(f"a   = {a_fit:.6f} Å^-1")
-        print(f"E0  = {E0_fit:.6f} Ha")
+def run_oh_scan(**opciones) -> None:
+    """
+    Escaneo del enlace O-H en la molécula de agua (H2O)
+    manteniendo fija la geometría del resto.
 
-    plt.xlabel("Distancia O-H (Å)")
-    plt.ylabel("Energía (Hartree)")
-    plt.title("Curva de energía para enlace O–H en H₂O (RHF / STO-3G)")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    Acepta las mismas opciones de palabra clave que run_bond_scan.
+    """
+    # Geometría base de agua (la misma que en examples/water.json)
+    run_bond_scan(
+        ["O", "H", "H"],
+        [[0.0, 0.0, 0.0], [0.0, -0.757, 0.587], [0.0, 0.757, 0.587]],
+        0,
+        1,
+        charge=0,
+        spin=0,
+        basis="sto-3g",
+        titulo="enlace O–H en H₂O",
+        **opciones,
+    )
 
 
 def main():
@@ -410,6 +851,73 @@ def main():
         metavar=("I", "J"),
         help="Escaneo genérico energía vs distancia entre átomos I y J (índices 1-based)",
     )
+    parser.add_argument(
+        "--no-plot",
+        action="store_true",
+        help="En los escaneos, omitir el ajuste de Morse y el gráfico (solo tabla/CSV)",
+    )
+    parser.add_argument(
+        "--csv",
+        type=str,
+        metavar="OUT",
+        help="En los escaneos, guardar los puntos R,E en este archivo CSV",
+    )
+    parser.add_argument(
+        "--save-plot",
+        type=str,
+        metavar="PATH",
+        help="En los escaneos, guardar el gráfico en PATH (PNG, PDF, ...) en vez de mostrarlo",
+    )
+    parser.add_argument(
+        "--uniform",
+        action="store_true",
+        help="En los escaneos, usar 30 distancias equiespaciadas en vez del muestreo adaptativo",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        metavar="DIR",
+        help="En los escaneos, guardar/reutilizar resultados SCF en este directorio (requiere joblib)",
+    )
+
+    # Opciones del cálculo SCF
+    parser.add_argument(
+        "--density-fit",
+        action="store_true",
+        help="Usar density fitting (RI) para las integrales de dos electrones",
+    )
+    parser.add_argument(
+        "--auxbasis",
+        type=str,
+        default="weigend",
+        help="Base auxiliar para --density-fit (default: weigend)",
+    )
+    parser.add_argument(
+        "--level-shift",
+        type=float,
+        default=0.0,
+        help="Desplazamiento de niveles en Hartree (default: 0.0)",
+    )
+    parser.add_argument(
+        "--damp",
+        type=float,
+        default=0.0,
+        help="Factor de amortiguamiento de la densidad (default: 0.0)",
+    )
+    parser.add_argument(
+        "--soscf",
+        action="store_true",
+        help="Usar SCF de segundo orden (Newton) para acelerar la convergencia",
+    )
+    parser.add_argument(
+        "--verbose",
+        type=int,
+        nargs="?",
+        const=3,
+        default=0,
+        metavar="N",
+        help="Mostrar el log de PySCF con nivel N (sin valor: 3; por defecto silencioso)",
+    )
 
     # Opción para usar archivo de input
     parser.add_argument(
@@ -468,6 +976,15 @@ def main():
     
     args = parser.parse_args()
 
+    if args.cache_dir:
+        try:
+            import joblib  # noqa: F401  # type: ignore[import]
+        except ImportError:
+            print(
+                "Aviso: --cache-dir requiere joblib; los resultados no se guardarán en disco",
+                file=sys.stderr,
+            )
+
     # Cargar input
     if args.file:
         # Cargar desde archivo
@@ -484,22 +1001,28 @@ def main():
         except KeyError as e:
             print(f"Error: Falta el campo requerido en el archivo: {e}", file=sys.stderr)
             sys.exit(1)
-        except json.JSONDecodeError as e:
+        except JSONDecodeError as e:
             print(f"Error: El archivo JSON no es válido: {e}", file=sys.stderr)
             sys.exit(1)
     elif args.symbols and args.coordinates:
         # Cargar desde argumentos de línea de comandos
         symbols = args.symbols
-        coords_flat = [float(x) for x in args.coordinates]
+        try:
+            coords_flat = np.fromiter(
+                (float(x) for x in args.coordinates),
+                dtype=np.float64,
+                count=len(args.coordinates),
+            )
+        except ValueError as e:
+            print(f"Error: Coordenada no numérica: {e}", file=sys.stderr)
+            sys.exit(1)
         
         if len(coords_flat) % 3 != 0:
             print("Error: El número de coordenadas debe ser múltiplo de 3", file=sys.stderr)
             sys.exit(1)
         
-        coordinates = [
-            coords_flat[i:i+3] 
-            for i in range(0, len(coords_flat), 3)
-        ]
+        # Matriz (n_átomos, 3) que se pasa tal cual a validación y cálculo
+        coordinates = coords_flat.reshape(-1, 3)
         charge = args.charge
         spin = args.spin
         basis = args.basis
@@ -508,12 +1031,27 @@ def main():
         parser.print_help()
         sys.exit(1)
 
+    # Opciones compartidas por los tres modos de escaneo
+    opciones_scan = dict(
+        plot=not args.no_plot,
+        csv_path=args.csv,
+        density_fit=args.density_fit,
+        auxbasis=args.auxbasis,
+        level_shift=args.level_shift,
+        damp=args.damp,
+        soscf=args.soscf,
+        verbose=args.verbose,
+        uniform=args.uniform,
+        cache_dir=args.cache_dir,
+        save_plot=args.save_plot,
+    )
+
     # Modos gráficos de escaneo dedicados (no requieren input previo)
     if args.scan_h2:
-        run_h2_scan()
+        run_h2_scan(**opciones_scan)
         return
     if args.scan_oh:
-        run_oh_scan()
+        run_oh_scan(**opciones_scan)
         return
 
     # Validar input
@@ -529,15 +1067,39 @@ def main():
         i_idx = i_cli - 1
         j_idx = j_cli - 1
         try:
-            run_bond_scan(symbols, coordinates, i_idx, j_idx, charge, spin, basis)
+            run_bond_scan(
+                symbols,
+                coordinates,
+                i_idx,
+                j_idx,
+                charge,
+                spin,
+                basis,
+                **opciones_scan,
+            )
         except Exception as e:
             print(f"Error durante el escaneo de enlace: {e}", file=sys.stderr)
             sys.exit(1)
         return
 
+    from .calculator import calculate_scf
+    from .output_formatter import format_results
+
     # Ejecutar cálculo simple
     try:
-        resultados = calculate_scf(symbols, coordinates, charge, spin, basis)
+        resultados = calculate_scf(
+            symbols,
+            coordinates,
+            charge,
+            spin,
+            basis,
+            density_fit=args.density_fit,
+            auxbasis=args.auxbasis,
+            level_shift=args.level_shift,
+            damp=args.damp,
+            soscf=args.soscf,
+            verbose=args.verbose,
+        )
     except Exception as e:
         print(f"Error durante el cálculo: {e}", file=sys.stderr)
         sys.exit(1)
@@ -548,7 +1110,7 @@ def main():
     if args.format == "json":
         print(output)
     else:
-        print(json.dumps(output, indent=2, ensure_ascii=False))
+        print(dumps(output).decode("utf-8"))
 
 
 if __name__ == "__main__":
@@ -2,10 +2,51 @@
 Módulo para validar y cargar inputs del usuario
 """
 
-import json
+import copy
+import os
+import re
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Tuple
 
+import numpy as np
+
+from ._json import loads
+
+# Números atómicos de los elementos soportados (hasta Ca)
+ATOMIC_NUMBERS: Dict[str, int] = {
+    "H": 1,
+    "He": 2,
+    "Li": 3,
+    "Be": 4,
+    "B": 5,
+    "C": 6,
+    "N": 7,
+    "O": 8,
+    "F": 9,
+    "Ne": 10,
+    "Na": 11,
+    "Mg": 12,
+    "Al": 13,
+    "Si": 14,
+    "P": 15,
+    "S": 16,
+    "Cl": 17,
+    "Ar": 18,
+    "K": 19,
+    "Ca": 20,
+}
+
+# Conjuntos inmutables construidos una vez al importar (validate_input se
+# llama en bucles de lote; no rehacerlos en cada llamada)
+_VALID_SYMBOLS: frozenset = frozenset(ATOMIC_NUMBERS)
+_VALID_BASES: frozenset = frozenset(("sto-3g", "6-31g", "cc-pvdz", "def2-svp"))
+
+# Lista de símbolos unida por "|" y formada solo por símbolos válidos
+# (alternativas más largas primero: "He" antes que "H")
+_SYMBOL_ALT = "|".join(sorted(_VALID_SYMBOLS, key=lambda s: (-len(s), s)))
+_SYMBOLS_RE = re.compile(rf"(?:{_SYMBOL_ALT})(?:\|(?:{_SYMBOL_ALT}))*")
+
 
 def validate_input(
     symbols: List[str],
@@ -34,55 +75,65 @@ def validate_input(
             f"Número de símbolos ({len(symbols)}) no coincide con número de coordenadas ({len(coordinates)})",
         )
 
-    # Validar símbolos químicos básicos (restringido para mantenerlo simple)
-    simbolos_validos = {
-        "H",
-        "He",
-        "Li",
-        "Be",
-        "B",
-        "C",
-        "N",
-        "O",
-        "F",
-        "Ne",
-        "Na",
-        "Mg",
-        "Al",
-        "Si",
-        "P",
-        "S",
-        "Cl",
-        "Ar",
-        "K",
-        "Ca",
-    }
-
-    for symbol in symbols:
-        if symbol not in simbolos_validos:
-            return False, f"Símbolo químico no soportado: {symbol}"
-
-    # Validar coordenadas
-    for i, coord in enumerate(coordinates):
-        if len(coord) != 3:
-            return (
-                False,
-                f"Coordenada {i} debe tener 3 componentes, tiene {len(coord)}",
-            )
-
-        for j, val in enumerate(coord):
-            if not isinstance(val, (int, float)):
+    # Validar símbolos químicos básicos (restringido para mantenerlo simple):
+    # una sola pasada de la regex compilada sobre "O|H|H"
+    try:
+        unidos = "|".join(symbols)
+        # El recuento de separadores descarta símbolos que contengan "|"
+        simbolos_ok = (
+            unidos.count("|") == len(symbols) - 1
+            and _SYMBOLS_RE.fullmatch(unidos) is not None
+        )
+    except TypeError:
+        # Algún símbolo no es str
+        simbolos_ok = False
+    if not simbolos_ok:
+        # Solo en el camino de error: reportar el primero en orden de entrada
+        for symbol in symbols:
+            if not isinstance(symbol, str) or symbol not in _VALID_SYMBOLS:
+                return False, f"Símbolo químico no soportado: {symbol}"
+
+    # Validar coordenadas: un único ndarray en vez de recorrer cada componente
+    try:
+        coords_arr = np.asarray(coordinates)
+    except ValueError:
+        # Filas de distinta longitud
+        coords_arr = None
+    if coords_arr is None or coords_arr.ndim != 2 or coords_arr.shape[1] != 3:
+        for i, coord in enumerate(coordinates):
+            if len(coord) != 3:
                 return (
                     False,
-                    f"Coordenada {i}[{j}] debe ser numérica, es {type(val)}",
+                    f"Coordenada {i} debe tener 3 componentes, tiene {len(coord)}",
                 )
+        return False, "Las coordenadas deben tener forma (n_átomos, 3)"
+
+    # Sin dtype forzado: cadenas u objetos quedan fuera de los tipos numéricos
+    if coords_arr.dtype.kind not in "iuf":
+        return False, f"Las coordenadas deben ser numéricas, son {coords_arr.dtype}"
+    if not np.isfinite(coords_arr).all():
+        i, j = np.argwhere(~np.isfinite(coords_arr))[0]
+        return False, f"Coordenada {i}[{j}] no es finita: {coords_arr[i, j]}"
+
+    # Validar carga/spin contra el número de electrones antes de construir
+    # la base en PySCF (que solo fallaría después de ese trabajo)
+    nelec = sum(ATOMIC_NUMBERS[symbol] for symbol in symbols) - (charge or 0)
+    spin_val = spin or 0
+    if nelec < 0:
+        return False, f"La carga {charge} deja un número negativo de electrones ({nelec})"
+    if (nelec - spin_val) % 2 != 0:
+        return (
+            False,
+            f"Spin {spin_val} incompatible con {nelec} electrones (N_elec - spin debe ser par)",
+        )
+    if abs(spin_val) > nelec:
+        return False, f"Spin {spin_val} mayor que el número de electrones ({nelec})"
 
     # Validar base
-    bases_validas = ["sto-3g", "6-31g", "cc-pvdz", "def2-svp"]
-    if basis not in bases_validas:
+    if basis not in _VALID_BASES:
         return (
             False,
-            f"Base no soportada: {basis}. Bases válidas: {', '.join(bases_validas)}",
+            f"Base no soportada: {basis}. Bases válidas: {', '.join(sorted(_VALID_BASES))}",
         )
 
     return True, ""
@@ -102,10 +153,12 @@ def _load_json_input(filepath: str) -> Dict[str, Any]:
         "basis": "sto-3g"
     }
     """
-    with open(filepath, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    # Bytes directos al decodificador (orjson acepta bytes sin pasar por str)
+    return loads(Path(filepath).read_bytes())
+
 
-    return data
+# Columnas de una línea de átomo XYZ: símbolo y coordenadas en Angstrom
+_XYZ_DTYPE = np.dtype([("sym", "U8"), ("x", "f8"), ("y", "f8"), ("z", "f8")])
 
 
 def _load_xyz_input(filepath: str) -> Dict[str, Any]:
@@ -123,11 +176,9 @@ def _load_xyz_input(filepath: str) -> Dict[str, Any]:
         charge = 0, spin = 0, basis = "sto-3g"
     y pueden sobreescribirse luego desde la CLI con --charge/--spin/--basis.
     """
-    symbols: List[str] = []
-    coordinates: List[List[float]] = []
-
-    with open(filepath, "r", encoding="utf-8") as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
+    # Una sola lectura; las líneas en blanco se descartan sin copiarlas con strip()
+    raw = Path(filepath).read_text(encoding="utf-8").splitlines()
+    lines = [line for line in raw if line and not line.isspace()]
 
     if len(lines) < 3:
         raise ValueError("Archivo XYZ demasiado corto.")
@@ -143,16 +194,34 @@ def _load_xyz_input(filepath: str) -> Dict[str, Any]:
             f"El archivo XYZ indica {n_atoms} átomos pero se encontraron {len(atom_lines)} líneas de coordenadas."
         )
 
-    for line in atom_lines:
-        parts = line.split()
-        if len(parts) != 4:
-            raise ValueError(
-                f"Línea XYZ inválida: '{line}'. Se espera: 'Simbolo x y z'."
-            )
-        sym = parts[0]
-        x, y, z = map(float, parts[1:4])
-        symbols.append(sym)
-        coordinates.append([x, y, z])
+    # Parseo en C de todas las líneas de átomos a la vez (sym, x, y, z)
+    try:
+        arr = np.genfromtxt(
+            atom_lines,
+            dtype=_XYZ_DTYPE,
+            comments=None,
+            encoding="utf-8",
+        )
+    except ValueError as exc:
+        # genfromtxt solo informa del número de columnas: localizar la línea
+        line = next(l for l in atom_lines if len(l.split()) != 4)
+        raise ValueError(
+            f"Línea XYZ inválida: '{line.strip()}'. Se espera: 'Simbolo x y z'."
+        ) from exc
+    # Con un único átomo genfromtxt devuelve un escalar estructurado
+    arr = np.atleast_1d(arr)
+
+    coords = np.column_stack((arr["x"], arr["y"], arr["z"]))
+    # Los valores no numéricos llegan como NaN en vez de lanzar excepción
+    malas = np.isnan(coords).any(axis=1)
+    if malas.any():
+        line = atom_lines[int(np.argmax(malas))]
+        raise ValueError(
+            f"Línea XYZ inválida: '{line.strip()}'. Se espera: 'Simbolo x y z'."
+        )
+
+    symbols = arr["sym"].tolist()
+    coordinates = coords.tolist()
 
     return {
         "name": Path(filepath).stem,
@@ -164,13 +233,13 @@ def _load_xyz_input(filepath: str) -> Dict[str, Any]:
     }
 
 
-def load_input_file(filepath: str) -> Dict[str, Any]:
+@lru_cache(maxsize=32)
+def _load_cached(filepath: str, mtime_ns: int) -> Dict[str, Any]:
     """
-    Carga un archivo de entrada de usuario y lo normaliza a un diccionario estándar.
+    Carga y normaliza un archivo de entrada, memorizado por (ruta, mtime).
 
-    Soporta:
-        - JSON con campos: symbols, coordinates, charge, spin, basis (name opcional)
-        - XYZ: se convierte a la misma estructura, con charge=0, spin=0, basis="sto-3g"
+    mtime_ns solo forma parte de la clave: si el archivo cambia en disco
+    la entrada anterior deja de coincidir y se vuelve a leer.
     """
     suffix = Path(filepath).suffix.lower()
 
@@ -184,5 +253,16 @@ def load_input_file(filepath: str) -> Dict[str, Any]:
     )
 
 
+def load_input_file(filepath: str) -> Dict[str, Any]:
+    """
+    Carga un archivo de entrada de usuario y lo normaliza a un diccionario estándar.
 
+    Soporta:
+        - JSON con campos: symbols, coordinates, charge, spin, basis (name opcional)
+        - XYZ: se convierte a la misma estructura, con charge=0, spin=0, basis="sto-3g"
 
+    Las lecturas repetidas del mismo archivo sin modificar se sirven desde
+    caché; se devuelve una copia para que el llamador pueda modificarla.
+    """
+    path = os.path.abspath(filepath)
+    return copy.deepcopy(_load_cached(path, os.stat(path).st_mtime_ns))
@@ -2,9 +2,11 @@
 Módulo para formatear y exportar resultados
 """
 
-import json
+from pathlib import Path
 from typing import Dict, Any
 
+from ._json import dumps
+
 
 def format_results(
     resultados: Dict[str, Any],
@@ -36,22 +38,14 @@ def format_results(
     if "tiempo_segundos" in resultados:
         output["tiempo_segundos"] = resultados["tiempo_segundos"]
 
-    if formato == "json":
-        json_str = json.dumps(output, indent=2, ensure_ascii=False)
+    # Codificar una sola vez: el mismo buffer va al archivo y a la salida JSON
+    payload = dumps(output) if (formato == "json" or output_file) else None
 
-        if output_file:
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(json_str)
+    if output_file:
+        Path(output_file).write_bytes(payload)
 
-        return json_str
+    if formato == "json":
+        return payload.decode("utf-8")
 
     # Formato dict
-    if output_file:
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
-
     return output
-
-
-
-
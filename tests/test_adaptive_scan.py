@@ -0,0 +1,118 @@
+"""
+Tests del muestreo adaptativo de distancias (cli.adaptive_scan)
+"""
+
+import unittest
+
+import numpy as np
+
+from scf_lite.cli import _interval_errors, adaptive_scan
+
+
+def _evaluador(f):
+    """
+    eval_fn de prueba: energía f(r) e "iteraciones" derivadas de r, para
+    comprobar que los resultados se reordenan junto con su distancia.
+    """
+    llamadas = []
+
+    def eval_fn(rs):
+        llamadas.append(np.array(rs))
+        return f(rs), np.round(rs * 1000).astype(np.int64)
+
+    return eval_fn, llamadas
+
+
+class TestIntervalErrors(unittest.TestCase):
+    def test_recta_sin_error(self):
+        rs = np.linspace(0.5, 2.0, 6)
+        errores = _interval_errors(rs, 3.0 * rs - 1.0)
+        self.assertEqual(errores.shape, (5,))
+        np.testing.assert_allclose(errores, 0.0, atol=1e-12)
+
+    def test_parabola_malla_uniforme(self):
+        # Para r^2 con paso h el punto central se aparta h^2 de la cuerda
+        h = 0.25
+        rs = np.arange(5) * h
+        errores = _interval_errors(rs, rs**2)
+        np.testing.assert_allclose(errores, h**2)
+
+    def test_malla_no_uniforme(self):
+        rs = np.array([0.0, 0.1, 0.4, 1.0])
+        errores = _interval_errors(rs, rs**2)
+        # Punto 0.1 frente a la cuerda (0, 0)-(0.4, 0.16): 0.04 - 0.01
+        # Punto 0.4 frente a la cuerda (0.1, 0.01)-(1, 1): 0.34 - 0.16
+        np.testing.assert_allclose(errores, [0.03, 0.18, 0.18])
+
+
+class TestAdaptiveScan(unittest.TestCase):
+    def test_recta_se_detiene_tras_puntos_iniciales(self):
+        eval_fn, llamadas = _evaluador(lambda rs: 2.0 * rs)
+        rs, es, its = adaptive_scan(eval_fn, 0.5, 2.0, n_init=8, max_pts=30)
+
+        self.assertEqual(len(llamadas), 1)
+        np.testing.assert_allclose(rs, np.linspace(0.5, 2.0, 8))
+        np.testing.assert_allclose(es, 2.0 * rs)
+
+    def test_respeta_max_pts(self):
+        eval_fn, _ = _evaluador(lambda rs: np.exp(-8.0 * rs))
+        for batch in (1, 3, 7):
+            rs, es, its = adaptive_scan(
+                eval_fn, 0.0, 2.0, rtol=1e-12, max_pts=20, n_init=8, batch=batch
+            )
+            self.assertEqual(len(rs), 20)
+            self.assertEqual(len(es), 20)
+            self.assertEqual(len(its), 20)
+
+    def test_max_pts_menor_que_n_init(self):
+        eval_fn, _ = _evaluador(lambda rs: rs**2)
+        rs, es, its = adaptive_scan(eval_fn, 0.0, 1.0, max_pts=5, n_init=8)
+        np.testing.assert_allclose(rs, np.linspace(0.0, 1.0, 5))
+
+    def test_salida_ordenada_y_alineada(self):
+        f = lambda rs: 0.3 * np.expm1(-2.0 * (rs - 1.0)) ** 2  # noqa: E731
+        eval_fn, _ = _evaluador(f)
+        rs, es, its = adaptive_scan(eval_fn, 0.5, 3.0, rtol=1e-4, max_pts=25, batch=4)
+
+        self.assertTrue(np.all(np.diff(rs) > 0))
+        self.assertEqual(rs[0], 0.5)
+        self.assertEqual(rs[-1], 3.0)
+        # Energías e iteraciones reordenadas junto con sus distancias
+        np.testing.assert_allclose(es, f(rs))
+        np.testing.assert_array_equal(its, np.round(rs * 1000).astype(np.int64))
+
+    def test_refina_donde_hay_curvatura(self):
+        eval_fn, _ = _evaluador(lambda rs: np.exp(-6.0 * rs))
+        rs, _, _ = adaptive_scan(eval_fn, 0.0, 2.0, rtol=1e-6, max_pts=24)
+        # La cola plana (r > 1) recibe menos puntos que la zona curva
+        self.assertGreater(np.sum(rs < 1.0), 2 * np.sum(rs > 1.0))
+
+    def test_criterio_de_parada(self):
+        eval_fn, llamadas = _evaluador(lambda rs: rs**2)
+        rs, es, _ = adaptive_scan(eval_fn, 0.0, 1.0, rtol=1e-3, max_pts=200, n_init=8)
+
+        self.assertLess(len(rs), 200)
+        self.assertGreater(len(llamadas), 1)
+        self.assertLess(_interval_errors(rs, es).max(), 1e-3)
+
+    def test_energias_nan_no_bloquean(self):
+        # Un SCF fallido en la cola no debe dejar el bucle sin avanzar
+        f = lambda rs: np.where(rs > 1.9, np.nan, np.exp(-6.0 * rs))  # noqa: E731
+        eval_fn, _ = _evaluador(f)
+        for batch in (1, 4):
+            rs, es, _ = adaptive_scan(
+                eval_fn, 0.0, 2.0, rtol=1e-12, max_pts=20, n_init=8, batch=batch
+            )
+            self.assertLessEqual(len(rs), 20)
+            self.assertTrue(np.all(np.diff(rs) > 0))
+            self.assertTrue(np.isnan(es[-1]))
+
+    def test_todo_nan_se_detiene(self):
+        eval_fn, llamadas = _evaluador(lambda rs: np.full_like(rs, np.nan))
+        rs, _, _ = adaptive_scan(eval_fn, 0.0, 1.0, max_pts=30, n_init=8)
+        self.assertEqual(len(rs), 8)
+        self.assertEqual(len(llamadas), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
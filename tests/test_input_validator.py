@@ -0,0 +1,180 @@
+"""
+Tests de la carga y validación de entradas (input_validator)
+"""
+
+import os
+import tempfile
+import unittest
+
+from scf_lite.input_validator import _load_xyz_input, load_input_file, validate_input
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples")
+
+AGUA = [[0.0, 0.0, 0.117], [0.0, 0.757, -0.467], [0.0, -0.757, -0.467]]
+
+
+def _xyz(contenido):
+    """
+    Escribe `contenido` en un .xyz temporal y devuelve su ruta.
+    """
+    fd, ruta = tempfile.mkstemp(suffix=".xyz")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(contenido)
+    return ruta
+
+
+class TestLoadXYZ(unittest.TestCase):
+    def _cargar(self, contenido):
+        ruta = _xyz(contenido)
+        self.addCleanup(os.remove, ruta)
+        return _load_xyz_input(ruta)
+
+    def test_molecula(self):
+        datos = self._cargar(
+            "3\nagua\nO 0.0 0.0 0.117\nH 0.0 0.757 -0.467\nH 0.0 -0.757 -0.467\n"
+        )
+        self.assertEqual(datos["symbols"], ["O", "H", "H"])
+        self.assertEqual(datos["coordinates"][1], [0.0, 0.757, -0.467])
+        self.assertEqual((datos["charge"], datos["spin"], datos["basis"]), (0, 0, "sto-3g"))
+
+    def test_un_solo_atomo(self):
+        datos = self._cargar("1\nhelio\nHe 0.0 0.0 0.0\n")
+        self.assertEqual(datos["symbols"], ["He"])
+        self.assertEqual(datos["coordinates"], [[0.0, 0.0, 0.0]])
+
+    def test_lineas_en_blanco_ignoradas(self):
+        datos = self._cargar("2\n\nH2\n\nH 0 0 0\n   \nH 0 0 0.74\n\n")
+        self.assertEqual(datos["symbols"], ["H", "H"])
+        self.assertEqual(datos["coordinates"][1], [0.0, 0.0, 0.74])
+
+    def test_columnas_de_mas_o_de_menos(self):
+        for linea in ("H 0.0 0.0", "H 0.0 0.0 0.74 1.0"):
+            with self.subTest(linea=linea):
+                with self.assertRaises(ValueError) as ctx:
+                    self._cargar(f"2\nH2\nH 0.0 0.0 0.0\n{linea}\n")
+                self.assertIn(f"Línea XYZ inválida: '{linea}'", str(ctx.exception))
+
+    def test_campo_no_numerico(self):
+        with self.assertRaises(ValueError) as ctx:
+            self._cargar("2\nH2\nH 0.0 0.0 0.0\nH 0.0 abc 0.74\n")
+        self.assertIn("Línea XYZ inválida: 'H 0.0 abc 0.74'", str(ctx.exception))
+
+    def test_numero_de_atomos_no_coincide(self):
+        with self.assertRaises(ValueError) as ctx:
+            self._cargar("3\nH2\nH 0 0 0\nH 0 0 0.74\n")
+        self.assertIn("indica 3 átomos", str(ctx.exception))
+
+    def test_cabecera_no_entera(self):
+        with self.assertRaises(ValueError):
+            self._cargar("dos\nH2\nH 0 0 0\nH 0 0 0.74\n")
+
+
+class TestValidateSymbols(unittest.TestCase):
+    def test_molecula_valida(self):
+        self.assertEqual(validate_input(["O", "H", "H"], AGUA), (True, ""))
+
+    def test_simbolo_con_separador(self):
+        # "H|H" casaría con la regex si no se contaran los separadores
+        ok, msg = validate_input(["O", "H|H"], AGUA[:2])
+        self.assertFalse(ok)
+        self.assertEqual(msg, "Símbolo químico no soportado: H|H")
+
+    def test_simbolos_no_str(self):
+        for simbolo in (1, None, b"H"):
+            with self.subTest(simbolo=simbolo):
+                ok, msg = validate_input(["O", simbolo, "H"], AGUA)
+                self.assertFalse(ok)
+                self.assertEqual(msg, f"Símbolo químico no soportado: {simbolo}")
+
+    def test_reporta_el_primer_simbolo_invalido(self):
+        ok, msg = validate_input(["O", "Xx", "Yy"], AGUA)
+        self.assertFalse(ok)
+        self.assertEqual(msg, "Símbolo químico no soportado: Xx")
+
+    def test_simbolo_vacio_o_en_minusculas(self):
+        for simbolos in (["O", "", "H"], ["o", "H", "H"]):
+            with self.subTest(simbolos=simbolos):
+                ok, _ = validate_input(simbolos, AGUA)
+                self.assertFalse(ok)
+
+
+class TestValidateCoordinates(unittest.TestCase):
+    def test_filas_de_distinta_longitud(self):
+        ok, msg = validate_input(["O", "H", "H"], [AGUA[0], [0.0, 0.757], AGUA[2]])
+        self.assertFalse(ok)
+        self.assertEqual(msg, "Coordenada 1 debe tener 3 componentes, tiene 2")
+
+    def test_filas_de_dos_columnas(self):
+        ok, msg = validate_input(["H", "H"], [[0.0, 0.0], [0.0, 0.74]])
+        self.assertFalse(ok)
+        self.assertEqual(msg, "Coordenada 0 debe tener 3 componentes, tiene 2")
+
+    def test_coordenadas_no_numericas(self):
+        ok, msg = validate_input(["H", "H"], [[0.0, 0.0, 0.0], [0.0, 0.0, "0.74"]])
+        self.assertFalse(ok)
+        self.assertTrue(msg.startswith("Las coordenadas deben ser numéricas, son <U"), msg)
+
+    def test_coordenadas_no_finitas(self):
+        for valor in (float("nan"), float("inf"), -float("inf")):
+            with self.subTest(valor=valor):
+                ok, msg = validate_input(["H", "H"], [[0.0, 0.0, 0.0], [0.0, valor, 0.74]])
+                self.assertFalse(ok)
+                self.assertEqual(msg, f"Coordenada 1[1] no es finita: {valor}")
+
+    def test_enteros_aceptados(self):
+        self.assertEqual(validate_input(["H", "H"], [[0, 0, 0], [0, 0, 1]]), (True, ""))
+
+    def test_entrada_vacia(self):
+        self.assertEqual(
+            validate_input([], []), (False, "Las coordenadas deben tener forma (n_átomos, 3)")
+        )
+
+
+class TestValidateElectrons(unittest.TestCase):
+    H2 = [[0.0, 0.0, 0.0], [0.0, 0.0, 0.74]]
+
+    def test_h2plus_valido(self):
+        self.assertEqual(validate_input(["H", "H"], self.H2, charge=1, spin=1), (True, ""))
+
+    def test_ejemplos_validos(self):
+        for nombre in ("h2plus.json", "oh_radical.json", "water.json", "nh3.xyz"):
+            with self.subTest(nombre=nombre):
+                datos = load_input_file(os.path.join(EXAMPLES, nombre))
+                self.assertEqual(
+                    validate_input(
+                        datos["symbols"],
+                        datos["coordinates"],
+                        datos["charge"],
+                        datos["spin"],
+                        datos["basis"],
+                    ),
+                    (True, ""),
+                )
+
+    def test_paridad_de_spin(self):
+        # H2 neutro: 2 electrones, spin 1 deja N_elec - spin impar
+        ok, msg = validate_input(["H", "H"], self.H2, charge=0, spin=1)
+        self.assertFalse(ok)
+        self.assertEqual(
+            msg, "Spin 1 incompatible con 2 electrones (N_elec - spin debe ser par)"
+        )
+
+    def test_carga_deja_electrones_negativos(self):
+        ok, msg = validate_input(["H", "H"], self.H2, charge=3, spin=1)
+        self.assertFalse(ok)
+        self.assertEqual(msg, "La carga 3 deja un número negativo de electrones (-1)")
+
+    def test_spin_mayor_que_electrones(self):
+        for spin in (4, -4):
+            with self.subTest(spin=spin):
+                ok, msg = validate_input(["H", "H"], self.H2, charge=0, spin=spin)
+                self.assertFalse(ok)
+                self.assertEqual(msg, f"Spin {spin} mayor que el número de electrones (2)")
+
+    def test_carga_y_spin_por_defecto(self):
+        # None equivale a 0 en ambos
+        self.assertEqual(validate_input(["O", "H", "H"], AGUA, None, None), (True, ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Tests del potencial tipo Morse, su Jacobiano analítico y la estimación
+inicial del ajuste (_morse)
+"""
+
+import importlib.util
+import os
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from scf_lite import _morse
+from scf_lite._morse import (
+    MORSE_BOUNDS,
+    morse,
+    morse_initial_guess,
+    morse_jac,
+    morse_residual,
+    morse_residual_jac,
+)
+
+# (De, a, Re, E0) parecidos a los de un enlace O–H en STO-3G
+PARAMS = (0.28, 2.08, 0.98, -74.96)
+R = np.linspace(0.6, 3.0, 40)
+
+HAS_NUMBA = importlib.util.find_spec("numba") is not None
+HAS_SCIPY = importlib.util.find_spec("scipy") is not None
+
+
+def _jac_numerico(R, p, h=1e-6):
+    """
+    Jacobiano de `morse` por diferencias centradas.
+    """
+    columnas = []
+    for k in range(4):
+        paso = np.zeros(4)
+        paso[k] = h
+        columnas.append((morse(R, *(p + paso)) - morse(R, *(p - paso))) / (2 * h))
+    return np.column_stack(columnas)
+
+
+class TestMorse(unittest.TestCase):
+    def test_formula(self):
+        De, a, Re, E0 = PARAMS
+        esperado = E0 + De * (1.0 - np.exp(-a * (R - Re))) ** 2
+        np.testing.assert_allclose(morse(R, *PARAMS), esperado, rtol=0, atol=1e-12)
+
+    def test_minimo_en_re(self):
+        De, a, Re, E0 = PARAMS
+        self.assertAlmostEqual(float(morse(np.array([Re]), *PARAMS)[0]), E0, places=12)
+
+    def test_jacobiano_frente_a_diferencias_finitas(self):
+        jac = morse_jac(R, *PARAMS)
+        self.assertEqual(jac.shape, (len(R), 4))
+        np.testing.assert_allclose(jac, _jac_numerico(R, np.array(PARAMS)), atol=1e-7)
+
+    def test_residuo_y_su_jacobiano(self):
+        p = np.array(PARAMS)
+        E = morse(R, *PARAMS) + 1e-3
+        np.testing.assert_allclose(morse_residual(p, R, E), -1e-3, atol=1e-12)
+        np.testing.assert_array_equal(morse_residual_jac(p, R, E), morse_jac(R, *PARAMS))
+
+    def test_acepta_listas_y_float32(self):
+        esperado = morse(R, *PARAMS)
+        np.testing.assert_allclose(morse(R.tolist(), *PARAMS), esperado)
+        np.testing.assert_allclose(morse(R.astype(np.float32), *PARAMS), esperado, atol=1e-6)
+
+
+@unittest.skipUnless(HAS_NUMBA, "numba no instalado")
+class TestMorseNumba(unittest.TestCase):
+    def test_nucleos_jit_igual_que_numpy(self):
+        ref = morse(R, *PARAMS)
+        ref_jac = morse_jac(R, *PARAMS)
+
+        with mock.patch.dict(os.environ, {"SCF_LITE_NUMBA": "1"}):
+            self.assertIsNot(_morse._kernels(len(R))[0], _morse._morse_numpy)
+            np.testing.assert_allclose(morse(R, *PARAMS), ref, atol=1e-12)
+            np.testing.assert_allclose(morse_jac(R, *PARAMS), ref_jac, atol=1e-12)
+
+    def test_numpy_por_defecto_en_escaneos_pequenos(self):
+        with mock.patch.dict(os.environ, {"SCF_LITE_NUMBA": ""}):
+            self.assertIs(_morse._kernels(30)[0], _morse._morse_numpy)
+        with mock.patch.dict(os.environ, {"SCF_LITE_NUMBA": "0"}):
+            self.assertIs(_morse._kernels(10**6)[0], _morse._morse_numpy)
+
+
+class TestMorseInitialGuess(unittest.TestCase):
+    def test_curva_sintetica(self):
+        De, a, Re, E0 = PARAMS
+        E = morse(R, *PARAMS)
+        De0, a0, Re0, E00 = morse_initial_guess(R, E)
+
+        # Re0 es el punto de la malla con menor energía
+        self.assertEqual(Re0, float(R[np.argmin(E)]))
+        self.assertLess(abs(Re0 - Re), R[1] - R[0])
+        np.testing.assert_allclose([De0, a0, E00], [De, a, E0], rtol=0.1, atol=0.01)
+
+    def test_devuelve_floats(self):
+        p0 = morse_initial_guess(R, morse(R, *PARAMS))
+        self.assertEqual(len(p0), 4)
+        self.assertTrue(all(type(x) is float for x in p0))
+
+    def test_respaldo_sin_de_positivo(self):
+        # Curva plana: la regresión da De = 0 para cualquier a
+        E = np.full_like(R, -1.0)
+        De0, a0, Re0, E00 = morse_initial_guess(R, E, a_fallback=1.7)
+        self.assertEqual(a0, 1.7)
+        self.assertEqual(Re0, float(R[0]))
+        self.assertEqual(E00, float(E[-1]))
+        self.assertEqual(De0, 0.0)
+
+    @unittest.skipUnless(HAS_SCIPY, "scipy no instalado")
+    def test_ajuste_recupera_parametros(self):
+        from scipy.optimize import least_squares
+
+        E = morse(R, *PARAMS)
+        p0 = morse_initial_guess(R, E)
+        res = least_squares(
+            morse_residual,
+            np.clip(p0, *MORSE_BOUNDS),
+            jac=morse_residual_jac,
+            bounds=MORSE_BOUNDS,
+            args=(R, E),
+        )
+        self.assertTrue(res.success)
+        np.testing.assert_allclose(res.x, PARAMS, rtol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
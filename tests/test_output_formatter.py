@@ -0,0 +1,89 @@
+"""
+Tests del formateo de resultados (output_formatter) con y sin orjson
+"""
+
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from scf_lite import _json
+from scf_lite.output_formatter import format_results
+
+HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+
+RESULTADOS = {
+    "energia": np.float64(-1.1167593),
+    "convergio": True,
+    "iteraciones": np.int64(3),
+    "metodo": "RHF",
+    "tiempo_segundos": 0.25,
+    "mol": object(),  # campos extra no llegan a la salida
+}
+
+
+class _Backends:
+    """
+    Ejecuta cada test con el backend indicado por `usar_orjson`.
+    """
+
+    usar_orjson = False
+
+    def setUp(self):
+        if not self.usar_orjson:
+            parche = mock.patch.object(_json, "orjson", None)
+            parche.start()
+            self.addCleanup(parche.stop)
+
+    def test_dict(self):
+        salida = format_results(RESULTADOS)
+        self.assertEqual(
+            set(salida), {"energia", "convergio", "iteraciones", "metodo", "tiempo_segundos"}
+        )
+
+    def test_json_con_escalares_numpy(self):
+        texto = format_results(RESULTADOS, formato="json")
+        self.assertIsInstance(texto, str)
+        self.assertEqual(
+            json.loads(texto),
+            {
+                "energia": -1.1167593,
+                "convergio": True,
+                "iteraciones": 3,
+                "metodo": "RHF",
+                "tiempo_segundos": 0.25,
+            },
+        )
+        self.assertTrue(texto.startswith('{\n  "energia"'))
+
+    def test_nan_como_json(self):
+        texto = format_results(
+            {"energia": float("nan"), "convergio": False, "iteraciones": 50}, formato="json"
+        )
+        self.assertIn('"energia": NaN', texto)
+
+    def test_archivo_igual_que_salida(self):
+        fd, ruta = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        self.addCleanup(os.remove, ruta)
+
+        texto = format_results(RESULTADOS, formato="json", output_file=ruta)
+        with open(ruta, encoding="utf-8") as f:
+            self.assertEqual(f.read(), texto)
+
+
+class TestFormatResultsJson(_Backends, unittest.TestCase):
+    usar_orjson = False
+
+
+@unittest.skipUnless(HAS_ORJSON, "orjson no instalado")
+class TestFormatResultsOrjson(_Backends, unittest.TestCase):
+    usar_orjson = True
+
+
+if __name__ == "__main__":
+    unittest.main()